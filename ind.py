@@ -1,24 +1,51 @@
 import os
+import sys
 import time
 import logging
 import base64
 import json
 import re
 import argparse
+import sqlite3
+import unicodedata
+import threading
+import asyncio
+import queue
+import pathlib
+import functools
+import cProfile
+import pstats
+import tracemalloc
+import atexit
+from contextlib import contextmanager
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime
+import pikepdf
 import pytesseract
 from PIL import Image
 from io import BytesIO
+from urllib.parse import urljoin
+from urllib.request import urlopen
 import undetected_chromedriver as uc
+from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support.ui import WebDriverWait as SeleniumWebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 import tempfile
+import shutil
+import psutil
+import subprocess
+from filelock import FileLock
 from bs4 import BeautifulSoup
-from flask import Flask, request, render_template
+from flask import Flask, request, render_template, Response, jsonify
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from websockets.sync.client import connect as websocket_connect
+from websockets.client import connect as async_websocket_connect
 
 # Configure logging
 logging.basicConfig(
@@ -33,101 +60,2398 @@ pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tessera
 
 app = Flask(__name__)
 
+# Google Drive client shared by every downloader in this process. It is built
+# lazily on the first upload so that construction stays cheap and modes which
+# never upload (navigation_only) work without credentials. The underlying
+# httplib2 connection is not thread-safe, so Drive calls hold the lock.
+_drive_service = None
+_drive_service_lock = threading.RLock()
+
+# Prometheus metrics, exposed on the /metrics route
+STAGE_DURATION = Histogram(
+    'index2_stage_duration_seconds', 'Time spent in each downloader stage', ['stage'],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600, float('inf'))
+)
+STAGE_ERRORS = Counter('index2_stage_errors_total', 'Stage calls that raised an exception', ['stage'])
+STAGE_RETRIES = Counter('index2_stage_retries_total', 'Retried attempts within a stage', ['stage'])
+CAPTCHA_ATTEMPTS = Counter('index2_captcha_attempts_total', 'Captchas sent to OCR')
+SEARCH_OUTCOMES = Counter('index2_search_outcomes_total', 'Classified responses to search submissions', ['outcome'])
+SCHEDULER_WAIT_SECONDS = Histogram(
+    'index2_scheduler_wait_seconds', 'Time jobs waited for browser capacity', ['priority'],
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, float('inf'))
+)
+SCHEDULER_RUNNING = Gauge('index2_scheduler_running_jobs', 'Jobs currently holding browser capacity', ['priority'])
+SCHEDULER_PREEMPTIONS = Counter('index2_scheduler_preemptions_total', 'Jobs paused at a document boundary for higher-priority work', ['priority'])
+SCHEDULER_CAPACITY = Gauge('index2_scheduler_capacity', 'Browser workers the scheduler currently admits')
+AUTOSCALER_DECISIONS = Counter('index2_autoscaler_decisions_total', 'Autoscaler decisions', ['decision'])
+HEDGED_SEARCHES = Counter('index2_hedged_searches_total', 'Stalled searches copied to a second session, by result', ['result'])
+SEARCH_ERRORS = Counter('index2_search_errors_total', 'Error codes shown by the search page', ['code'])
+DOCUMENTS_DOWNLOADED = Counter('index2_documents_downloaded_total', 'IndexII documents saved as PDF')
+UPLOAD_BYTES = Counter('index2_upload_bytes_total', 'Bytes uploaded to Google Drive')
+WEBDRIVER_COMMAND_DURATION = Histogram(
+    'index2_webdriver_command_seconds', 'Round-trip time of WebDriver commands', ['command'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf'))
+)
+SITE_CIRCUIT_OPEN = Gauge('index2_site_circuit_open', '1 while the IGR site circuit breaker is open')
+SITE_PROBES = Counter('index2_site_probes_total', 'IGR site health probes', ['result'])
+PAGE_BYTES = Histogram(
+    'index2_page_bytes', 'Bytes transferred to load a site page', ['page', 'network_policy'],
+    buckets=(50e3, 100e3, 250e3, 500e3, 1e6, 2.5e6, 5e6, 10e6, float('inf'))
+)
+PAGE_LOAD_SECONDS = Histogram(
+    'index2_page_load_seconds', 'Navigation-to-load time of a site page', ['page', 'network_policy'],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, float('inf'))
+)
+BROWSER_RSS = Gauge('index2_browser_rss_megabytes', 'Resident memory of the last checked Chrome process tree')
+BROWSER_RECYCLES = Counter('index2_browser_recycles_total', 'Browsers restarted by the supervisor', ['reason'])
+BROWSER_ORPHANS_KILLED = Counter('index2_browser_orphans_killed_total', 'Orphaned Chrome processes killed')
+BROWSER_LAUNCH_SECONDS = Histogram(
+    'index2_browser_launch_seconds', 'Time to start the scraping browser', ['phase'],
+    buckets=(0.25, 0.5, 1, 2, 3, 5, 10, 20, 30, 60, float('inf'))
+)
+JOB_TIMEOUTS = Counter('index2_job_timeouts_total', 'Jobs aborted at their wall-clock limit')
+PDF_BYTES_SAVED = Counter('index2_pdf_bytes_saved_total', 'Bytes removed from output PDFs by compaction')
+WEBDRIVER_CALL_SITE_COMMANDS = Counter('index2_webdriver_call_site_commands_total', 'WebDriver commands issued per downloader method', ['call_site'])
+
+# Resources the automation never needs on the search pages, blocked with
+# Network.setBlockedURLs when network_policy="lean". The captcha image is served
+# by Handler.ashx, which none of these patterns may match, so it always loads.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.bmp", "*.ico", "*.svg", "*.webp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp3", "*.mp4", "*.swf",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*facebook.com/plugins*", "*platform.twitter.com*", "*addthis.com*"
+]
+
+# Page.printToPDF settings shared by the scraping browser and the snapshot renderers
+PDF_PRINT_PARAMS = {
+    "landscape": False,
+    "printBackground": True,
+    "paperWidth": 8.27,  # A4 width in inches
+    "paperHeight": 11.69,  # A4 height in inches
+    "marginTop": 0.4,
+    "marginBottom": 0.4,
+    "marginLeft": 0.4,
+    "marginRight": 0.4,
+    "scale": 0.9,
+    "pageRanges": "",
+    "preferCSSPageSize": True
+}
+
+def timed_stage(stage):
+    """Record the duration and failures of a downloader stage"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start_time = time.time()
+            tracer = current_tracer()
+            try:
+                if tracer:
+                    with tracer.span(stage, "stage"):
+                        return method(*args, **kwargs)
+                return method(*args, **kwargs)
+            except Exception:
+                STAGE_ERRORS.labels(stage=stage).inc()
+                raise
+            finally:
+                STAGE_DURATION.labels(stage=stage).observe(time.time() - start_time)
+        return wrapper
+    return decorator
+
+# Tracer of the job running on the current thread, if tracing is enabled
+_trace_context = threading.local()
+
+def current_tracer():
+    """Return the JobTracer active on this thread, or None"""
+    return getattr(_trace_context, "tracer", None)
+
+class JobTracer:
+    """Collect nested spans for one job and write them in Chrome trace-event format"""
+    
+    # tracemalloc is process-wide, so it runs while any profiled job needs it
+    _tracemalloc_users = 0
+    _tracemalloc_lock = threading.Lock()
+    
+    def __init__(self, trace_path, profile=False):
+        self.trace_path = trace_path
+        self.profile = profile
+        self.events = []
+        self.lock = threading.Lock()
+        self.start_time = time.perf_counter()
+        self.profiler = None
+        self.tracing_allocations = False
+        
+    @contextmanager
+    def span(self, name, category, **args):
+        """Record the enclosed block as a complete ('X') trace event"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": round((start - self.start_time) * 1e6),
+                "dur": round((time.perf_counter() - start) * 1e6),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args
+            }
+            with self.lock:
+                self.events.append(event)
+        
+    def start(self):
+        """Make this the active tracer of the current thread and start the profilers if requested"""
+        _trace_context.tracer = self
+        if self.profile:
+            try:
+                self.profiler = cProfile.Profile()
+                self.profiler.enable()
+            except Exception as e:
+                logger.warning(f"Could not start profiler: {e}")
+                self.profiler = None
+                return
+            with JobTracer._tracemalloc_lock:
+                # Allocation tracing started outside the tracers is left alone and not reported
+                if JobTracer._tracemalloc_users or not tracemalloc.is_tracing():
+                    if not JobTracer._tracemalloc_users:
+                        tracemalloc.start(25)
+                    JobTracer._tracemalloc_users += 1
+                    self.tracing_allocations = True
+        
+    def finish(self):
+        """Stop tracing and write the trace file, returning its path"""
+        _trace_context.tracer = None
+        metadata = {}
+        os.makedirs(os.path.dirname(self.trace_path), exist_ok=True)
+        
+        if self.profiler:
+            self.profiler.disable()
+            self.profiler.dump_stats(os.path.splitext(self.trace_path)[0] + ".prof")
+            
+            # Top functions by cumulative time
+            stats = pstats.Stats(self.profiler).stats
+            hotspots = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:30]
+            metadata["cpu_hotspots"] = [{
+                "function": f"{filename}:{line}({function})",
+                "calls": calls,
+                "total_time": round(total_time, 4),
+                "cumulative_time": round(cumulative_time, 4)
+            } for (filename, line, function), (_, calls, total_time, cumulative_time, _) in hotspots]
+            
+        if self.tracing_allocations:
+            # Top allocation sites still alive at the end of the job
+            # (tracemalloc is process-wide, so concurrent jobs show up here too)
+            with JobTracer._tracemalloc_lock:
+                snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+                JobTracer._tracemalloc_users -= 1
+                if JobTracer._tracemalloc_users == 0:
+                    tracemalloc.stop()
+            self.tracing_allocations = False
+            if snapshot:
+                metadata["allocation_hotspots"] = [{
+                    "location": str(statistic.traceback[0]),
+                    "size_bytes": statistic.size,
+                    "count": statistic.count
+                } for statistic in snapshot.statistics("lineno")[:30]]
+        
+        with self.lock:
+            trace = {"traceEvents": list(self.events), "displayTimeUnit": "ms", "metadata": metadata}
+        
+        with open(self.trace_path, "w", encoding="utf-8") as f:
+            json.dump(trace, f, ensure_ascii=False)
+        logger.info(f"Saved job trace to {self.trace_path}")
+        return self.trace_path
+
+class WebDriverWait(SeleniumWebDriverWait):
+    """WebDriverWait that records each wait in the active job trace"""
+    
+    def until(self, method, message=""):
+        tracer = current_tracer()
+        if not tracer:
+            return super().until(method, message)
+        with tracer.span("wait", "wait", timeout=self._timeout):
+            return super().until(method, message)
+
+class WebDriverCommandStats:
+    """Count WebDriver commands and their round-trip time by call site and by command"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.by_call_site = {}  # method name -> [commands, seconds]
+        self.by_command = {}  # WebDriver command -> [commands, seconds]
+        
+    def record(self, call_site, command, seconds):
+        with self.lock:
+            for totals, key in ((self.by_call_site, call_site), (self.by_command, command)):
+                entry = totals.setdefault(key, [0, 0.0])
+                entry[0] += 1
+                entry[1] += seconds
+        
+    def report(self):
+        """Totals sorted by time spent, most expensive first"""
+        with self.lock:
+            def rows(totals):
+                return [{"name": name, "commands": count, "seconds": round(seconds, 3)}
+                        for name, (count, seconds) in sorted(totals.items(), key=lambda item: item[1][1], reverse=True)]
+            return {
+                "total_commands": sum(count for count, _ in self.by_command.values()),
+                "total_seconds": round(sum(seconds for _, seconds in self.by_command.values()), 3),
+                "by_call_site": rows(self.by_call_site),
+                "by_command": rows(self.by_command)
+            }
+        
+    def format_report(self):
+        """Human readable summary, one line per call site"""
+        report = self.report()
+        lines = [f"WebDriver commands: {report['total_commands']} commands, {report['total_seconds']:.1f}s"]
+        for row in report["by_call_site"]:
+            lines.append(f"  {row['name']}: {row['commands']} commands, {row['seconds']:.1f}s")
+        return "\n".join(lines)
+
+def find_call_site():
+    """Name of the innermost Index2Downloader method on the current stack"""
+    frame = sys._getframe(2)
+    while frame:
+        if frame.f_code.co_name != "instrumented_execute" and isinstance(frame.f_locals.get("self"), Index2Downloader):
+            return frame.f_code.co_name
+        frame = frame.f_back
+    return "unknown"
+
+class LatencyModel:
+    """Rolling latency samples per operation, persisted across runs and used to size timeouts"""
+    
+    _shared = {}
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, path, window=200, min_samples=5):
+        self.path = path
+        self.window = window  # Samples kept per operation, newest last
+        self.min_samples = min_samples  # Below this the hard-coded defaults are used
+        self.lock = threading.Lock()
+        self.samples = {}
+        
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.samples = {operation: list(values)[-window:] for operation, values in json.load(f).items()}
+            logger.info(f"Loaded latency model from {self.path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not load latency model, starting empty: {e}")
+        
+    @classmethod
+    def shared(cls, path):
+        """One model per file for the whole process, so all downloaders learn together"""
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls(path)
+            return cls._shared[path]
+        
+    def observe(self, operation, seconds):
+        """Record how long an operation took (or the timeout it hit)"""
+        with self.lock:
+            values = self.samples.setdefault(operation, [])
+            values.append(round(seconds, 3))
+            del values[:-self.window]
+        
+    def percentile(self, operation, q):
+        """Return the q-th quantile (0-1) of recent samples, or None if there are too few"""
+        with self.lock:
+            values = sorted(self.samples.get(operation, []))
+        if len(values) < self.min_samples:
+            return None
+        return values[min(len(values) - 1, int(q * len(values)))]
+        
+    def recent_median(self, operation, count=10):
+        """Median of the newest samples, which reacts faster than the window-wide percentiles"""
+        with self.lock:
+            values = sorted(self.samples.get(operation, [])[-count:])
+        if len(values) < self.min_samples:
+            return None
+        return values[len(values) // 2]
+        
+    def timeout(self, operation, default, multiplier=3, minimum=5, maximum=600):
+        """Timeout for a wait: a multiple of the recent p95, or the default until enough samples exist"""
+        p95 = self.percentile(operation, 0.95)
+        if p95 is None:
+            return default
+        return max(minimum, min(maximum, p95 * multiplier))
+        
+    def typical(self, operation, default):
+        """Median duration, used where the code has to pause for the site to react"""
+        p50 = self.percentile(operation, 0.5)
+        return default if p50 is None else p50
+        
+    def retry_delay(self, operation, default, minimum=2):
+        """Initial backoff before retrying an operation, scaled to its typical latency"""
+        p50 = self.percentile(operation, 0.5)
+        if p50 is None:
+            return default
+        return max(minimum, min(default, p50))
+        
+    def save(self):
+        """Write the samples to disk atomically"""
+        with self.lock:
+            data = json.dumps(self.samples)
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, delete=False) as f:
+                f.write(data)
+            os.replace(f.name, self.path)
+        except Exception as e:
+            logger.warning(f"Could not save latency model: {e}")
+
+class SiteUnavailableError(Exception):
+    """Raised instead of starting a job while the IGR site is known to be down"""
+    pass
+
+class SiteCircuitBreaker:
+    """Circuit breaker for the IGR site shared by every worker, with a background health prober"""
+    
+    def __init__(self, url, failure_threshold=2, cooldown=60, probe_interval=30, probe_timeout=15, state_path=None):
+        self.url = url
+        self.failure_threshold = failure_threshold  # Consecutive failed jobs that open the circuit
+        self.cooldown = cooldown  # Seconds the circuit stays open before a probe may close it
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.state_path = state_path  # Lets separate worker processes see each other's verdict
+        self.condition = threading.Condition()
+        self.consecutive_failures = 0
+        self.open_until = 0
+        self.prober = None
+        
+    def is_open(self):
+        """True while the site is considered unhealthy"""
+        with self.condition:
+            return time.time() < max(self.open_until, self.read_shared_state())
+        
+    def read_shared_state(self):
+        """open_until written by another process, or 0"""
+        if not self.state_path:
+            return 0
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("open_until", 0)
+        except Exception:
+            return 0
+        
+    def write_shared_state(self):
+        if not self.state_path:
+            return
+        try:
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=os.path.dirname(os.path.abspath(self.state_path)), delete=False) as f:
+                json.dump({"open_until": self.open_until}, f)
+            os.replace(f.name, self.state_path)
+        except Exception as e:
+            logger.warning(f"Could not write circuit breaker state: {e}")
+        
+    def probe(self):
+        """Lightweight HTTP check of the site's home page"""
+        try:
+            with urlopen(self.url, timeout=self.probe_timeout) as response:
+                healthy = response.status < 500
+        except Exception as e:
+            logger.info(f"Site health probe failed: {e}")
+            healthy = False
+        SITE_PROBES.labels(result='success' if healthy else 'failure').inc()
+        return healthy
+        
+    def record_success(self):
+        with self.condition:
+            self.consecutive_failures = 0
+            if self.open_until or self.read_shared_state():
+                logger.info("IGR site is healthy again, closing circuit")
+                self.open_until = 0
+                self.write_shared_state()
+            SITE_CIRCUIT_OPEN.set(0)
+            self.condition.notify_all()
+        
+    def record_failure(self):
+        with self.condition:
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= self.failure_threshold:
+                self.trip()
+        
+    def trip(self):
+        """Open the circuit and start probing until the site answers again"""
+        with self.condition:
+            if time.time() >= self.open_until:
+                logger.warning(f"IGR site looks down, opening circuit for at least {self.cooldown}s")
+            self.open_until = time.time() + self.cooldown
+            self.write_shared_state()
+            SITE_CIRCUIT_OPEN.set(1)
+            if not self.prober or not self.prober.is_alive():
+                self.prober = threading.Thread(target=self.probe_loop, name="site-prober", daemon=True)
+                self.prober.start()
+        
+    def probe_loop(self):
+        """Probe the site while the circuit is open and close it on the first success"""
+        while True:
+            with self.condition:
+                wait = max(self.probe_interval, self.open_until - time.time())
+            time.sleep(wait)
+            if self.probe():
+                self.record_success()
+                return
+            with self.condition:
+                self.open_until = time.time() + self.probe_interval
+                self.write_shared_state()
+        
+    def wait_until_healthy(self, timeout):
+        """Park the caller until the circuit closes; returns False if it is still open after timeout"""
+        deadline = time.time() + timeout
+        with self.condition:
+            while time.time() < max(self.open_until, self.read_shared_state()):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                # Re-check at least every probe interval in case another process closed it
+                self.condition.wait(min(remaining, self.probe_interval))
+        return True
+        
+    def check(self, park_timeout=0):
+        """Raise SiteUnavailableError if the site is down, optionally parking the caller first"""
+        if not self.is_open():
+            return
+        if park_timeout and self.wait_until_healthy(park_timeout):
+            return
+        raise SiteUnavailableError("The IGR website is currently unavailable, please try again later")
+
+class NoSearchResultsError(Exception):
+    """Raised when the site answered the search with no records (empty grid or error 3046)"""
+    
+    def __init__(self, message, outcome):
+        super().__init__(message)
+        self.outcome = outcome
+
+class JobScheduler:
+    """Admit jobs to this process's browser capacity by priority class, with a concurrency share per class"""
+    
+    PRIORITIES = ("interactive", "bulk")  # Highest first
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, capacity=4, shares=None):
+        self.capacity = capacity  # Browsers allowed to work at the same time
+        self.shares = shares or {"interactive": 1.0, "bulk": 0.75}  # Share of the capacity each class may hold
+        self.condition = threading.Condition()
+        self.running = {priority: 0 for priority in self.PRIORITIES}
+        self.waiting = {priority: 0 for priority in self.PRIORITIES}
+        self.waits = deque(maxlen=200)  # (admitted at, seconds waited) for the autoscaler
+        self.queued = []  # Times the jobs still waiting were queued
+        self.busy_at = time.time()  # Last time every slot was taken or a job was queued
+        SCHEDULER_CAPACITY.set(capacity)
+        
+    @classmethod
+    def shared(cls):
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+        
+    def limit(self, priority):
+        return max(1, int(self.capacity * self.shares[priority]))
+        
+    def higher_waiting(self, priority):
+        """Whether a job of a more important class is queued"""
+        return any(self.waiting[higher] for higher in self.PRIORITIES[:self.PRIORITIES.index(priority)])
+        
+    def can_start(self, priority):
+        if sum(self.running.values()) >= self.capacity or self.running[priority] >= self.limit(priority):
+            return False
+        # Lower classes queue behind higher ones
+        return not self.higher_waiting(priority)
+        
+    def acquire(self, priority):
+        """Block until a job of this class may use a browser"""
+        if priority not in self.PRIORITIES:
+            raise Exception(f"Unknown job priority '{priority}'")
+        
+        wait_start = time.time()
+        with self.condition:
+            self.waiting[priority] += 1
+            self.busy_at = time.time()
+            self.queued.append(wait_start)
+            try:
+                self.condition.wait_for(lambda: self.can_start(priority))
+            finally:
+                self.waiting[priority] -= 1
+                self.queued.remove(wait_start)
+            self.running[priority] += 1
+            SCHEDULER_RUNNING.labels(priority=priority).set(self.running[priority])
+            if sum(self.running.values()) >= self.capacity:
+                self.busy_at = time.time()
+            waited = time.time() - wait_start
+            self.waits.append((time.time(), waited))
+            # Wake lower classes that were only held back by this waiter
+            self.condition.notify_all()
+        
+        SCHEDULER_WAIT_SECONDS.labels(priority=priority).observe(waited)
+        return waited
+        
+    def release(self, priority):
+        with self.condition:
+            self.running[priority] -= 1
+            SCHEDULER_RUNNING.labels(priority=priority).set(self.running[priority])
+            self.condition.notify_all()
+        
+    def should_yield(self, priority):
+        """Whether a running job should step aside for a queued job of a higher class"""
+        with self.condition:
+            return self.higher_waiting(priority) and sum(self.running.values()) >= self.capacity
+        
+    def set_capacity(self, capacity):
+        """Resize the pool; running jobs above a lowered capacity finish normally"""
+        with self.condition:
+            self.capacity = capacity
+            SCHEDULER_CAPACITY.set(capacity)
+            self.condition.notify_all()
+        
+    def load(self, window):
+        """Snapshot of the queue for scaling decisions, with the p95 wait over the last window seconds"""
+        with self.condition:
+            now = time.time()
+            if any(self.waiting.values()) or sum(self.running.values()) >= self.capacity:
+                self.busy_at = now
+            # Jobs still queued count with the wait they have had so far
+            waits = sorted([waited for admitted_at, waited in self.waits if now - admitted_at <= window] +
+                           [now - queued_at for queued_at in self.queued])
+            return {
+                "capacity": self.capacity,
+                "running": sum(self.running.values()),
+                "waiting": sum(self.waiting.values()),
+                "wait_p95": waits[min(len(waits) - 1, int(0.95 * len(waits)))] if waits else 0.0,
+                "busy_at": self.busy_at
+            }
+        
+    def yield_slot(self, priority):
+        """Hand the slot to waiting higher-priority work and queue for it again; returns seconds paused"""
+        SCHEDULER_PREEMPTIONS.labels(priority=priority).inc()
+        self.release(priority)
+        return self.acquire(priority)
+
+class SearchCancelledError(Exception):
+    """Raised in a hedge session when the search it was copying has already been answered"""
+
+class HedgedSearch:
+    """A copy of a stalled search running on a second session"""
+    
+    def __init__(self, hedger):
+        self.hedger = hedger
+        self.session = None
+        self.future = Future()
+        self.cancelled = threading.Event()
+        
+    def cancel(self):
+        """Stop the copy at its next poll; its session returns to the pool once it has stopped"""
+        self.cancelled.set()
+        self.future.add_done_callback(lambda _: self.release())
+        
+    def release(self):
+        if self.session:
+            self.hedger.release(self.session)
+
+class SearchHedger:
+    """Idle search sessions used to hedge stalled searches, with the hedge rate capped"""
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, max_sessions=2, max_hedge_ratio=0.1, window=600, idle_timeout=300):
+        self.max_sessions = max_sessions  # Extra browsers kept for hedging in this process
+        self.max_hedge_ratio = max_hedge_ratio  # At most this share of recent searches is hedged
+        self.window = window  # Seconds of history the ratio is computed over
+        self.idle_timeout = idle_timeout  # Idle sessions are closed after this many seconds
+        self.lock = threading.Lock()
+        self.idle = []
+        self.sessions = 0
+        self.searches = deque()
+        self.hedges = deque()
+        
+    @classmethod
+    def shared(cls):
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+        
+    def _trim(self, now):
+        for times in (self.searches, self.hedges):
+            while times and now - times[0] > self.window:
+                times.popleft()
+        
+    def record_search(self):
+        with self.lock:
+            now = time.time()
+            self._trim(now)
+            self.searches.append(now)
+        
+    def launch(self, primary):
+        """Start the primary's current search on another session, or return None if over budget"""
+        with self.lock:
+            now = time.time()
+            self._trim(now)
+            # A single hedge is always allowed so that a quiet worker can still recover from a stall
+            if len(self.hedges) >= max(1, int(self.max_hedge_ratio * len(self.searches))):
+                HEDGED_SEARCHES.labels(result='over_budget').inc()
+                return None
+            
+            session = self.idle.pop()[0] if self.idle else None
+            if session is None:
+                if self.sessions >= self.max_sessions:
+                    HEDGED_SEARCHES.labels(result='no_session').inc()
+                    return None
+                self.sessions += 1
+            self.hedges.append(now)
+        
+        hedge = HedgedSearch(self)
+        search = primary.last_search
+        
+        def run():
+            try:
+                # Starting a browser takes seconds, so it is done here rather than in the stalled job
+                hedge.session = session or primary.create_hedge_session()
+                hedge.session.search_cancelled = hedge.cancelled
+                hedge.session.current_property_number = primary.current_property_number
+                hedge.session.search_key = primary.search_key
+                hedge.session.run_search(*search)
+                hedge.future.set_result(True)
+            except Exception as e:
+                if hedge.session is None:
+                    self.forget_session()
+                hedge.future.set_exception(e)
+        
+        threading.Thread(target=run, name="search-hedge", daemon=True).start()
+        HEDGED_SEARCHES.labels(result='launched').inc()
+        logger.info(f"Hedging stalled search for property {primary.current_property_number} on a second session")
+        return hedge
+        
+    def release(self, session):
+        """Put a session back in the idle pool"""
+        with self.lock:
+            self.idle.append((session, time.time()))
+        reaper = threading.Timer(self.idle_timeout, self.retire_idle, args=(self.idle_timeout,))
+        reaper.daemon = True
+        reaper.start()
+        
+    def retire_idle(self, max_idle):
+        """Close sessions idle for longer than max_idle seconds; returns how many were closed"""
+        with self.lock:
+            now = time.time()
+            retired = [session for session, idle_since in self.idle if now - idle_since >= max_idle]
+            self.idle = [(session, idle_since) for session, idle_since in self.idle if now - idle_since < max_idle]
+            self.sessions -= len(retired)
+        for session in retired:
+            try:
+                session.close()
+            except Exception as e:
+                logger.warning(f"Error closing idle hedge session: {e}")
+        if retired:
+            logger.info(f"Closed {len(retired)} hedge sessions idle for {max_idle}s")
+        return len(retired)
+        
+    def forget_session(self):
+        """Free the slot of a session that could not be started"""
+        with self.lock:
+            self.sessions -= 1
+
+class PoolAutoscaler:
+    """Grow and shrink the scheduler's browser capacity from queue depth, wait time, site latency and host load"""
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, scheduler, latency, min_workers=1, max_workers=6, interval=15, scale_up_wait=10,
+                 step_interval=60, cool_down=300, max_cpu_percent=75, browser_mb=700, min_free_mb=1024,
+                 max_site_latency=30, pressure_ticks=4):
+        self.scheduler = scheduler
+        self.latency = latency
+        self.min_workers = min_workers
+        self.max_workers = max_workers  # Politeness ceiling: concurrent browsers this process may point at the site
+        self.interval = interval  # Seconds between decisions
+        self.scale_up_wait = scale_up_wait  # p95 queue wait in seconds that justifies another worker
+        self.step_interval = step_interval  # Seconds to let the last scaling step take effect before the next
+        self.cool_down = cool_down  # Seconds of spare capacity before a worker is retired
+        self.max_cpu_percent = max_cpu_percent
+        self.browser_mb = browser_mb  # Memory a new Chrome is expected to take
+        self.min_free_mb = min_free_mb  # Memory left to the rest of the host
+        self.max_site_latency = max_site_latency  # Recent median page load above which the site is not pushed harder
+        self.pressure_ticks = pressure_ticks  # Consecutive ticks over a host ceiling before capacity is shed
+        self.ticks_over_ceiling = 0
+        self.last_change = 0
+        self.thread = None
+        
+    @classmethod
+    def shared(cls, latency):
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(JobScheduler.shared(), latency)
+            return cls._shared
+        
+    def start(self):
+        """Start the decision loop once per process"""
+        with self._shared_lock:
+            if self.thread and self.thread.is_alive():
+                return
+            psutil.cpu_percent()  # The first reading only sets the baseline
+            self.thread = threading.Thread(target=self.run, name="pool-autoscaler", daemon=True)
+            self.thread.start()
+        logger.info(f"Autoscaling browser workers between {self.min_workers} and {self.max_workers}")
+        
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.tick()
+            except Exception as e:
+                logger.warning(f"Autoscaler tick failed: {e}")
+        
+    def inputs(self):
+        """Everything a decision is based on"""
+        load = self.scheduler.load(self.interval * 4)
+        load.update({
+            "cpu_percent": psutil.cpu_percent(),
+            "free_mb": int(psutil.virtual_memory().available / (1024 * 1024)),
+            "site_open": site_breaker.is_open(),
+            "site_latency": self.latency.recent_median('page_load')
+        })
+        return load
+        
+    def decide(self, inputs):
+        """Return (decision, new capacity, reason) for the given inputs"""
+        capacity = inputs["capacity"]
+        now = time.time()
+        
+        # Shed capacity under sustained host pressure, whatever the queue looks like;
+        # rendering alone pushes the CPU over the ceiling in short bursts
+        pressure = None
+        if inputs["cpu_percent"] > self.max_cpu_percent:
+            pressure = "CPU above ceiling"
+        elif inputs["free_mb"] < self.min_free_mb:
+            pressure = "memory below reserve"
+        self.ticks_over_ceiling = self.ticks_over_ceiling + 1 if pressure else 0
+        if pressure and capacity > self.min_workers:
+            if self.ticks_over_ceiling < self.pressure_ticks:
+                return "hold", capacity, f"{pressure} for {self.ticks_over_ceiling} of {self.pressure_ticks} ticks"
+            if now - self.last_change < self.step_interval:
+                return "hold", capacity, f"{pressure}, waiting for the last scaling step to take effect"
+            return "down", capacity - 1, f"{pressure} for {self.ticks_over_ceiling} ticks"
+        
+        if inputs["waiting"] and inputs["wait_p95"] >= self.scale_up_wait:
+            if capacity >= self.max_workers:
+                return "hold", capacity, "at politeness ceiling"
+            if inputs["site_open"]:
+                return "hold", capacity, "site circuit is open"
+            if inputs["site_latency"] is not None and inputs["site_latency"] > self.max_site_latency:
+                return "hold", capacity, "site latency degraded"
+            if inputs["cpu_percent"] > self.max_cpu_percent * 0.8:
+                return "hold", capacity, "not enough CPU headroom"
+            if inputs["free_mb"] - self.browser_mb < self.min_free_mb:
+                return "hold", capacity, "not enough memory for another browser"
+            if now - self.last_change < self.step_interval:
+                return "steady", capacity, "waiting for the last scaling step to take effect"
+            return "up", capacity + 1, "jobs are queueing"
+        
+        if capacity > self.min_workers and now - inputs["busy_at"] >= self.cool_down:
+            return "down", capacity - 1, f"spare capacity for {self.cool_down}s"
+        return "steady", capacity, "load matches capacity"
+        
+    def tick(self):
+        """Take one scaling decision, apply it and log it with its inputs"""
+        inputs = self.inputs()
+        decision, capacity, reason = self.decide(inputs)
+        AUTOSCALER_DECISIONS.labels(decision=decision).inc()
+        
+        summary = (f"capacity={inputs['capacity']} running={inputs['running']} waiting={inputs['waiting']} "
+                   f"wait_p95={inputs['wait_p95']:.1f}s cpu={inputs['cpu_percent']:.0f}% free={inputs['free_mb']}MB "
+                   f"site_open={inputs['site_open']} site_latency={inputs['site_latency']}")
+        if decision == "steady":
+            logger.debug(f"Autoscaler steady ({reason}): {summary}")
+        else:
+            logger.info(f"Autoscaler {decision} to {capacity} workers ({reason}): {summary}")
+        
+        if capacity != inputs["capacity"]:
+            self.last_change = time.time()
+            self.scheduler.set_capacity(capacity)
+
+class SearchResultCache:
+    """SQLite cache of search outcomes and downloaded documents, keyed by the normalized query"""
+    
+    _shared = {}
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, path, positive_ttl=24 * 3600, negative_ttl=3600):
+        self.path = path
+        self.positive_ttl = positive_ttl  # Seconds a harvested row list stays valid
+        self.negative_ttl = negative_ttl  # Seconds a "no results" answer stays valid
+        with self.connect() as connection:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS searches (
+                    query_key TEXT PRIMARY KEY,
+                    outcome TEXT NOT NULL,
+                    records TEXT,
+                    cached_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS documents (
+                    query_key TEXT NOT NULL,
+                    doc_number TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    downloaded_at REAL NOT NULL,
+                    PRIMARY KEY (query_key, doc_number)
+                );
+            """)
+        
+    @classmethod
+    def shared(cls, path):
+        """One store per file for the whole process, so the schema is set up once, on first use"""
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls(path)
+            return cls._shared[path]
+        
+    def connect(self):
+        # A short-lived connection per call keeps the cache safe to use from any thread
+        return closing_connection(sqlite3.connect(self.path, timeout=30))
+        
+    @staticmethod
+    def make_key(year, district_name, taluka_name, village_name, property_number):
+        """Normalize the search parameters so equivalent queries share one entry"""
+        parts = []
+        for value in (year, district_name, taluka_name, village_name, property_number):
+            value = unicodedata.normalize("NFC", str(value or ""))
+            parts.append(" ".join(value.split()).casefold())
+        return "|".join(parts)
+        
+    def get(self, query_key):
+        """Return the cached outcome for a query, or None if missing or expired"""
+        with self.connect() as connection:
+            row = connection.execute(
+                "SELECT outcome, records, cached_at FROM searches WHERE query_key = ?", (query_key,)
+            ).fetchone()
+        if not row:
+            return None
+        
+        outcome, records, cached_at = row
+        ttl = self.positive_ttl if outcome == "results" else self.negative_ttl
+        if time.time() - cached_at > ttl:
+            return None
+        
+        return {"outcome": outcome, "records": json.loads(records) if records else [], "cached_at": cached_at}
+        
+    def put_results(self, query_key, records):
+        self.put(query_key, "results", records)
+        
+    def put_negative(self, query_key, outcome):
+        self.put(query_key, outcome, None)
+        
+    def put(self, query_key, outcome, records):
+        with self.connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO searches (query_key, outcome, records, cached_at) VALUES (?, ?, ?, ?)",
+                (query_key, outcome, json.dumps(records, ensure_ascii=False) if records is not None else None, time.time())
+            )
+        
+    def get_documents(self, query_key):
+        """Download results already stored for a query, keyed by document number"""
+        with self.connect() as connection:
+            rows = connection.execute(
+                "SELECT doc_number, result FROM documents WHERE query_key = ?", (query_key,)
+            ).fetchall()
+        return {doc_number: json.loads(result) for doc_number, result in rows}
+        
+    def put_document(self, query_key, doc_number, result):
+        with self.connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO documents (query_key, doc_number, result, downloaded_at) VALUES (?, ?, ?, ?)",
+                (query_key, doc_number, json.dumps(result, ensure_ascii=False), time.time())
+            )
+
+@contextmanager
+def closing_connection(connection):
+    """Commit (or roll back) and close an sqlite3 connection"""
+    try:
+        with connection:
+            yield connection
+    finally:
+        connection.close()
+
+class PropertyWatchStore:
+    """SQLite record of the registrations already seen for each watched property"""
+    
+    _shared = {}
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, path):
+        self.path = path
+        with self.connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS watched_properties (
+                    query_key TEXT PRIMARY KEY,
+                    params TEXT NOT NULL,
+                    doc_numbers TEXT NOT NULL,
+                    last_reg_date TEXT,
+                    last_synced_at REAL NOT NULL
+                )
+            """)
+        
+    @classmethod
+    def shared(cls, path):
+        """One store per file for the whole process, so the schema is set up once, on first use"""
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls(path)
+            return cls._shared[path]
+        
+    def connect(self):
+        return closing_connection(sqlite3.connect(self.path, timeout=30))
+        
+    def get(self, query_key):
+        """Return the stored state of a property, or None if it was never synced"""
+        with self.connect() as connection:
+            row = connection.execute(
+                "SELECT params, doc_numbers, last_reg_date, last_synced_at FROM watched_properties WHERE query_key = ?",
+                (query_key,)
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "params": json.loads(row[0]),
+            "doc_numbers": json.loads(row[1]),
+            "last_reg_date": row[2],
+            "last_synced_at": row[3]
+        }
+        
+    def put(self, query_key, params, doc_numbers, last_reg_date):
+        with self.connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO watched_properties (query_key, params, doc_numbers, last_reg_date, last_synced_at) VALUES (?, ?, ?, ?, ?)",
+                (query_key, json.dumps(params, ensure_ascii=False), json.dumps(sorted(doc_numbers), ensure_ascii=False), last_reg_date, time.time())
+            )
+        
+    def list_properties(self):
+        """Parameters of every watched property"""
+        with self.connect() as connection:
+            rows = connection.execute("SELECT params FROM watched_properties ORDER BY query_key").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+def parse_reg_date(reg_date):
+    """Parse a DD/MM/YYYY registration date from the results grid, or return None"""
+    try:
+        return datetime.strptime(reg_date.strip(), "%d/%m/%Y")
+    except (AttributeError, ValueError):
+        return None
+
+# Numbered fields of the IndexII (Suchi 2) report
+INDEXII_FIELDS = {
+    1: "doc_type",
+    2: "consideration",
+    3: "market_value",
+    4: "property_description",
+    5: "area",
+    6: "assessment",
+    7: "executants",
+    8: "claimants",
+    9: "execution_date",
+    10: "registration_date",
+    11: "serial_number",
+    12: "stamp_duty",
+    13: "registration_fee",
+    14: "remarks"
+}
+
+DEVANAGARI_DIGITS = str.maketrans("०१२३४५६७८९", "0123456789")
+
+def parse_amount(text):
+    """First number in a report value (Devanagari digits and thousands separators allowed), or None"""
+    match = re.search(r"\d[\d,]*(?:\.\d+)?", (text or "").translate(DEVANAGARI_DIGITS))
+    if not match:
+        return None
+    try:
+        return float(match.group().replace(",", ""))
+    except ValueError:
+        return None
+
+def parse_parties(text):
+    """Names of the parties listed in an executant/claimant field"""
+    text = " ".join((text or "").split())
+    names = re.findall(r"नाव\s*:?\s*-?\s*(.+?)(?=\s+वय\s*:|\s+पत्ता\s*:|\s+पॅन\s*नं|\s*\d+\)\s*:|$)", text)
+    if not names:
+        names = re.split(r"\s*\d+\)\s*:?\s*-?", text)
+    return [name.strip(" -:,;") for name in names if name.strip(" -:,;")]
+
+# unicode61 splits on M* by default, which cuts Devanagari words at every vowel sign and virama
+FTS_TOKENIZER = "unicode61 remove_diacritics 0 categories 'L* N* Co M*'"
+
+def normalize_search_text(text):
+    """Fold Devanagari text into the form stored in the full-text index"""
+    text = unicodedata.normalize("NFC", text or "")
+    # Joiners only affect glyph shaping and would otherwise split identical words into different tokens
+    text = text.replace("\u200c", "").replace("\u200d", "")
+    return text.translate(DEVANAGARI_DIGITS)
+
+def build_fts_query(query):
+    """Turn free text into an FTS5 query matching every word as a prefix"""
+    # Devanagari block without the danda and double danda, which end sentences
+    tokens = re.findall(r"[\w\u0900-\u0963\u0966-\u097F]+", normalize_search_text(query))
+    return " ".join(f'"{token}"*' for token in tokens)
+
+@functools.lru_cache(maxsize=None)
+def check_fts_tokenizer():
+    """Make sure this SQLite keeps whole Devanagari words together, so one word cannot match another"""
+    with closing_connection(sqlite3.connect(":memory:")) as connection:
+        connection.execute(f"CREATE VIRTUAL TABLE probe USING fts5(body, tokenize = \"{FTS_TOKENIZER}\")")
+        connection.execute("INSERT INTO probe (body) VALUES (?)", (normalize_search_text("शिंदे सर्वे नं. १२"),))
+        for query, expected in (("शिंदे", 1), ("शिंदा", 0), ("सर्वा", 0), ("नं", 1)):
+            found = connection.execute("SELECT count(*) FROM probe WHERE probe MATCH ?", (build_fts_query(query),)).fetchone()[0]
+            if found != expected:
+                raise Exception(f"SQLite FTS5 tokenizer splits Devanagari words: '{query}' matched {found} rows, expected {expected}")
+
+def parse_indexii_report(html):
+    """Extract the IndexII report fields from the report page HTML"""
+    soup = BeautifulSoup(html, "html.parser")
+    page_text = " ".join(soup.get_text(" ").split())
+    report = {"fields": {}, "text": page_text}
+    
+    # Numbered rows: a "(N) label" cell followed by the value cell
+    for row in soup.find_all("tr"):
+        cells = [" ".join(cell.get_text(" ").split()) for cell in row.find_all("td", recursive=False)]
+        if len(cells) < 2:
+            continue
+        label, value = cells[0], " ".join(cells[1:]).strip()
+        match = re.match(r"\(?\s*(\d+)\s*\)", label.translate(DEVANAGARI_DIGITS))
+        if not match:
+            continue
+        number = int(match.group(1))
+        report["fields"][label] = value
+        if number in INDEXII_FIELDS and INDEXII_FIELDS[number] not in report:
+            report[INDEXII_FIELDS[number]] = value
+    
+    # Header lines outside the numbered table
+    for key, pattern in (
+        ("doc_number", r"दस्त\s*क्रमांक\s*:\s*([\d०-९]+\s*/\s*[\d०-९]+)"),
+        ("sro_name", r"दुय्यम\s*निबंधक\s*:\s*(.+?)(?=\s+दस्त\s*क्रमांक|\s+नोंदणी|\s+नोदंणी|\s+Regn|$)"),
+        ("village_name", r"गावाचे\s*नाव\s*:\s*(.+?)(?=\s+\(\s*1\s*\)|\s+\(१\)|$)")
+    ):
+        match = re.search(pattern, page_text)
+        if match:
+            report[key] = match.group(1).translate(DEVANAGARI_DIGITS).strip()
+    
+    if "doc_number" not in report and report.get("serial_number"):
+        report["doc_number"] = report["serial_number"].translate(DEVANAGARI_DIGITS).split()[0]
+    
+    report["consideration"] = parse_amount(report.get("consideration"))
+    report["market_value"] = parse_amount(report.get("market_value"))
+    report["stamp_duty"] = parse_amount(report.get("stamp_duty"))
+    report["executants"] = parse_parties(report.get("executants"))
+    report["claimants"] = parse_parties(report.get("claimants"))
+    for key in ("execution_date", "registration_date"):
+        match = re.search(r"\d{1,2}/\d{1,2}/\d{4}", (report.get(key) or "").translate(DEVANAGARI_DIGITS))
+        report[key] = match.group() if match else None
+    
+    return report
+
+def shows_document_number(text, doc_number):
+    """Whether a report's text is the report of this document, judged by its दस्त क्रमांक header"""
+    text = (text or "").translate(DEVANAGARI_DIGITS)
+    wanted_number, _, wanted_year = re.sub(r"\s+", "", str(doc_number).translate(DEVANAGARI_DIGITS)).partition("/")
+    match = re.search(r"दस्त\s*क्रमांक\s*:?\s*(\d+)(?:\s*/\s*(\d+))?", text)
+    if match and wanted_number.isdigit():
+        found_number, found_year = match.groups()
+        return int(found_number) == int(wanted_number) and (not found_year or not wanted_year or found_year == wanted_year)
+    # Without the header the number has to stand alone, not inside a longer number or a date
+    wanted = f"{wanted_number}/{wanted_year}" if wanted_year else wanted_number
+    return re.search(rf"(?<![\d/]){re.escape(wanted)}(?![\d/])", text) is not None
+
+class IndexIIDatabase:
+    """SQLite store of the fields extracted from downloaded IndexII reports"""
+    
+    _shared = {}
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, path):
+        self.path = path
+        with self.connect() as connection:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS indexii_documents (
+                    id INTEGER PRIMARY KEY,
+                    doc_number TEXT,
+                    sro_name TEXT,
+                    registration_date TEXT,
+                    execution_date TEXT,
+                    doc_type TEXT,
+                    consideration REAL,
+                    market_value REAL,
+                    stamp_duty REAL,
+                    area TEXT,
+                    property_description TEXT,
+                    year TEXT,
+                    district_name TEXT,
+                    taluka_name TEXT,
+                    village_name TEXT,
+                    property_number TEXT,
+                    url TEXT,
+                    file_path TEXT,
+                    drive_link TEXT,
+                    fields TEXT NOT NULL,
+                    extracted_at REAL NOT NULL,
+                    UNIQUE (doc_number, sro_name)
+                );
+                CREATE TABLE IF NOT EXISTS indexii_parties (
+                    document_id INTEGER NOT NULL REFERENCES indexii_documents(id) ON DELETE CASCADE,
+                    role TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    name_key TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_indexii_doc_number ON indexii_documents (doc_number);
+                CREATE INDEX IF NOT EXISTS idx_indexii_village_consideration ON indexii_documents (village_name, consideration);
+                CREATE INDEX IF NOT EXISTS idx_indexii_registration_date ON indexii_documents (registration_date);
+                CREATE INDEX IF NOT EXISTS idx_indexii_property ON indexii_documents (property_number);
+                CREATE INDEX IF NOT EXISTS idx_indexii_file_path ON indexii_documents (file_path);
+                CREATE INDEX IF NOT EXISTS idx_indexii_party_name ON indexii_parties (name_key);
+                CREATE INDEX IF NOT EXISTS idx_indexii_party_document ON indexii_parties (document_id);
+            """)
+            self.create_text_index(connection)
+            self.create_party_index(connection)
+        
+    @classmethod
+    def shared(cls, path):
+        """One store per file for the whole process, so the schema is set up once, on first use"""
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls(path)
+            return cls._shared[path]
+        
+    def create_party_index(self, connection):
+        """Word index of party names, so a name part can be looked up without scanning every party"""
+        if connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'indexii_party_text'").fetchone():
+            return
+        connection.execute(f"""
+            CREATE VIRTUAL TABLE indexii_party_text USING fts5(
+                name,
+                document_id UNINDEXED,
+                tokenize = "{FTS_TOKENIZER}",
+                prefix = '2 3'
+            )
+        """)
+        connection.executemany(
+            "INSERT INTO indexii_party_text (name, document_id) VALUES (?, ?)",
+            [(normalize_search_text(name_key), document_id)
+             for name_key, document_id in connection.execute("SELECT name_key, document_id FROM indexii_parties").fetchall()]
+        )
+        
+    def create_text_index(self, connection):
+        """Create the full-text index, rebuilding one made with an older tokenizer"""
+        check_fts_tokenizer()
+        existing = connection.execute("SELECT sql FROM sqlite_master WHERE name = 'indexii_text'").fetchone()
+        if existing and FTS_TOKENIZER in existing[0]:
+            return
+        
+        rows = []
+        if existing:
+            logger.info("Rebuilding the report full-text index with the Devanagari-aware tokenizer")
+            rows = connection.execute("SELECT title, body, document_id FROM indexii_text").fetchall()
+            connection.execute("DROP TABLE indexii_text")
+        connection.execute(f"""
+            CREATE VIRTUAL TABLE indexii_text USING fts5(
+                title,
+                body,
+                document_id UNINDEXED,
+                tokenize = "{FTS_TOKENIZER}",
+                prefix = '2 3'
+            )
+        """)
+        connection.executemany("INSERT INTO indexii_text (title, body, document_id) VALUES (?, ?, ?)", rows)
+        
+    def connect(self):
+        return closing_connection(sqlite3.connect(self.path, timeout=30))
+        
+    @staticmethod
+    def name_key(name):
+        """Normalized form of a party name used for lookups"""
+        return " ".join(unicodedata.normalize("NFC", name or "").split()).casefold()
+        
+    @staticmethod
+    def iso_date(value):
+        parsed = parse_reg_date(value)
+        return parsed.strftime("%Y-%m-%d") if parsed else None
+        
+    def put(self, report, property_info, url=None, file_path=None):
+        """Store an extracted report, replacing an earlier copy of the same document; returns its id"""
+        row = {
+            "doc_number": report.get("doc_number") or property_info.get("doc_number"),
+            "sro_name": report.get("sro_name") or property_info.get("sro_name"),
+            "registration_date": self.iso_date(report.get("registration_date") or property_info.get("reg_date")),
+            "execution_date": self.iso_date(report.get("execution_date")),
+            "doc_type": report.get("doc_type") or property_info.get("doc_type"),
+            "consideration": report.get("consideration"),
+            "market_value": report.get("market_value"),
+            "stamp_duty": report.get("stamp_duty"),
+            "area": report.get("area"),
+            "property_description": report.get("property_description"),
+            "year": str(property_info.get("year") or ""),
+            "district_name": property_info.get("district_name"),
+            "taluka_name": property_info.get("taluka_name"),
+            "village_name": property_info.get("village_name") or report.get("village_name"),
+            "property_number": str(property_info.get("property_number") or ""),
+            "url": url,
+            "file_path": file_path,
+            "fields": json.dumps(report.get("fields", {}), ensure_ascii=False),
+            "extracted_at": time.time()
+        }
+        
+        with self.connect() as connection:
+            connection.execute("PRAGMA foreign_keys = ON")
+            for table in ("indexii_text", "indexii_party_text"):
+                connection.execute(
+                    f"DELETE FROM {table} WHERE document_id IN (SELECT id FROM indexii_documents WHERE doc_number IS ? AND sro_name IS ?)",
+                    (row["doc_number"], row["sro_name"])
+                )
+            connection.execute(
+                "DELETE FROM indexii_documents WHERE doc_number IS ? AND sro_name IS ?",
+                (row["doc_number"], row["sro_name"])
+            )
+            cursor = connection.execute(
+                f"INSERT INTO indexii_documents ({', '.join(row)}) VALUES ({', '.join('?' for _ in row)})",
+                list(row.values())
+            )
+            document_id = cursor.lastrowid
+            self.index_text(connection, document_id, row, report.get("text", ""))
+            parties = [(document_id, role, name, self.name_key(name))
+                       for role in ("executants", "claimants") for name in report.get(role, [])]
+            connection.executemany(
+                "INSERT INTO indexii_parties (document_id, role, name, name_key) VALUES (?, ?, ?, ?)", parties
+            )
+            connection.executemany(
+                "INSERT INTO indexii_party_text (name, document_id) VALUES (?, ?)",
+                [(normalize_search_text(name_key), document_id) for document_id, _, _, name_key in parties]
+            )
+        return document_id
+        
+    def index_text(self, connection, document_id, row, text):
+        """Add a report's text to the full-text index"""
+        title = " ".join(str(row.get(key) or "") for key in ("doc_number", "doc_type", "village_name", "property_number"))
+        connection.execute(
+            "INSERT INTO indexii_text (title, body, document_id) VALUES (?, ?, ?)",
+            (normalize_search_text(title), normalize_search_text(text), document_id)
+        )
+        
+    def search(self, query, limit=20):
+        """Rank stored reports against a free-text query (names, survey numbers, ...)"""
+        fts_query = build_fts_query(query)
+        if not fts_query:
+            return []
+        
+        with self.connect() as connection:
+            connection.row_factory = sqlite3.Row
+            rows = connection.execute("""
+                SELECT d.id, d.doc_number, d.sro_name, d.registration_date, d.doc_type, d.village_name,
+                       d.property_number, d.file_path, d.drive_link,
+                       snippet(indexii_text, 1, '[', ']', '…', 12) AS snippet,
+                       bm25(indexii_text, 5.0, 1.0) AS rank
+                FROM indexii_text
+                JOIN indexii_documents d ON d.id = indexii_text.document_id
+                WHERE indexii_text MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            """, (fts_query, int(limit))).fetchall()
+        return [dict(row) for row in rows]
+        
+    def set_drive_link(self, file_path, drive_link):
+        with self.connect() as connection:
+            connection.execute("UPDATE indexii_documents SET drive_link = ? WHERE file_path = ?", (drive_link, file_path))
+        
+    def query(self, party=None, village=None, min_consideration=None, max_consideration=None,
+              doc_number=None, sro_name=None, date_from=None, date_to=None, limit=100):
+        """Find stored documents; dates are YYYY-MM-DD and party matches names containing words starting with its words"""
+        conditions = []
+        values = []
+        party_query = build_fts_query(self.name_key(party)) if party else None
+        if party_query:
+            conditions.append("id IN (SELECT document_id FROM indexii_party_text WHERE indexii_party_text MATCH ?)")
+            values.append(party_query)
+        for column, value in (("village_name", village), ("doc_number", doc_number), ("sro_name", sro_name)):
+            if value:
+                conditions.append(f"{column} = ?")
+                values.append(value)
+        for condition, value in (("consideration >= ?", min_consideration), ("consideration <= ?", max_consideration),
+                                 ("registration_date >= ?", date_from), ("registration_date <= ?", date_to)):
+            if value is not None and value != "":
+                conditions.append(condition)
+                values.append(value)
+        
+        sql = "SELECT * FROM indexii_documents"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY registration_date DESC, id DESC LIMIT ?"
+        values.append(int(limit))
+        
+        with self.connect() as connection:
+            connection.row_factory = sqlite3.Row
+            documents = [dict(row) for row in connection.execute(sql, values).fetchall()]
+            for document in documents:
+                document["fields"] = json.loads(document["fields"])
+                parties = connection.execute(
+                    "SELECT role, name FROM indexii_parties WHERE document_id = ?", (document["id"],)
+                ).fetchall()
+                for role in ("executants", "claimants"):
+                    document[role] = [party["name"] for party in parties if party["role"] == role]
+        return documents
+
+def compact_pdf(file_path):
+    """Rewrite a PDF with recompressed streams and object streams, returning the bytes saved"""
+    original_size = os.path.getsize(file_path)
+    compact_path = file_path + ".compact"
+    
+    with pikepdf.open(file_path) as pdf:
+        # printToPDF already subsets the embedded fonts; drop anything no page refers to
+        pdf.remove_unreferenced_resources()
+        pdf.save(
+            compact_path,
+            compress_streams=True,
+            recompress_flate=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate
+        )
+    
+    saved = original_size - os.path.getsize(compact_path)
+    if saved > 0:
+        os.replace(compact_path, file_path)
+        PDF_BYTES_SAVED.inc(saved)
+        return saved
+    
+    os.remove(compact_path)
+    return 0
+
+def build_pdf_bundle(documents, bundle_path):
+    """Merge (title, pdf_path) pairs into one PDF with a bookmark per document"""
+    os.makedirs(os.path.dirname(bundle_path), exist_ok=True)
+    
+    with pikepdf.new() as bundle:
+        sources = []
+        with bundle.open_outline() as outline:
+            for title, pdf_path in documents:
+                source = pikepdf.open(pdf_path)
+                sources.append(source)
+                outline.root.append(pikepdf.OutlineItem(title, len(bundle.pages)))
+                bundle.pages.extend(source.pages)
+        
+        bundle.remove_unreferenced_resources()
+        bundle.save(
+            bundle_path,
+            compress_streams=True,
+            recompress_flate=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate
+        )
+        for source in sources:
+            source.close()
+    
+    return bundle_path
+
+class SnapshotRenderPool:
+    """Local headless Chrome renderers that turn captured MHTML snapshots into PDFs off the scraping path"""
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, workers=2):
+        self.jobs = queue.Queue()
+        self.closed = False
+        self.threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self.worker_loop, name=f"snapshot-renderer-{i+1}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        logger.info(f"Started {workers} snapshot renderers")
+        
+    @classmethod
+    def shared(cls, workers=2):
+        """One renderer pool for the whole process, started on first use"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(workers)
+                # The renderer threads are daemons, so without this their Chrome processes outlive the interpreter
+                atexit.register(cls._shared.close)
+            return cls._shared
+        
+    def submit(self, snapshot_path, pdf_path, on_rendered=None):
+        """Queue a snapshot for rendering; on_rendered(pdf_path) runs on the renderer thread once the PDF exists"""
+        future = Future()
+        self.jobs.put((snapshot_path, pdf_path, on_rendered, future))
+        return future
+        
+    def create_renderer(self):
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-extensions")
+        # Snapshots are self-contained; route any network request to a dead proxy
+        options.add_argument("--proxy-server=127.0.0.1:9")
+        options.add_argument("--proxy-bypass-list=<-loopback>")
+        return webdriver.Chrome(options=options)
+        
+    def worker_loop(self):
+        """Render queued snapshots until close() is called"""
+        renderer = None
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            
+            snapshot_path, pdf_path, on_rendered, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            
+            try:
+                if renderer is None:
+                    renderer = self.create_renderer()
+                
+                renderer.get(pathlib.Path(snapshot_path).resolve().as_uri())
+                with STAGE_DURATION.labels(stage='render_pdf').time():
+                    pdf_data = renderer.execute_cdp_cmd("Page.printToPDF", PDF_PRINT_PARAMS)
+                with open(pdf_path, "wb") as f:
+                    f.write(base64.b64decode(pdf_data['data']))
+                logger.info(f"Rendered snapshot to PDF: {pdf_path}")
+                
+                future.set_result(on_rendered(pdf_path) if on_rendered else pdf_path)
+            except Exception as e:
+                logger.error(f"Error rendering snapshot {snapshot_path}: {e}")
+                future.set_exception(e)
+                
+                # Start a fresh renderer for the next job in case this one is broken
+                if renderer:
+                    try:
+                        renderer.quit()
+                    except Exception:
+                        pass
+                    renderer = None
+        
+        if renderer:
+            renderer.quit()
+        
+    def close(self):
+        """Stop the renderers after the queued snapshots are done"""
+        if self.closed:
+            return
+        self.closed = True
+        logger.info("Waiting for queued snapshot renders before shutting down the renderers...")
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join()
+
+class CdpEventListener:
+    """Receive DevTools events from the browser-wide websocket of a running Chrome"""
+    
+    def __init__(self, debugger_address):
+        self.debugger_address = debugger_address
+        self.connection = None
+        self.thread = None
+        self.condition = threading.Condition()
+        self.events = deque(maxlen=1000)
+        self.event_count = 0
+        self.responses = {}
+        self.next_id = 0
+        self.sessions = {}  # sessionId -> targetId
+        self.loaded_targets = {}  # targetId -> time its load event fired
+        
+    def start(self):
+        """Connect to the browser endpoint and start tracking page targets"""
+        with urlopen(f"http://{self.debugger_address}/json/version", timeout=10) as response:
+            websocket_url = json.loads(response.read().decode("utf-8"))["webSocketDebuggerUrl"]
+        
+        self.connection = websocket_connect(websocket_url, max_size=None, open_timeout=10)
+        self.thread = threading.Thread(target=self._receive_loop, name="cdp-events", daemon=True)
+        self.thread.start()
+        
+        self.send("Target.setDiscoverTargets", {"discover": True})
+        logger.info(f"Listening for DevTools events on {self.debugger_address}")
+        
+    def _receive_loop(self):
+        """Dispatch responses and events until the connection closes"""
+        try:
+            for message in self.connection:
+                data = json.loads(message)
+                with self.condition:
+                    if "id" in data:
+                        self.responses[data["id"]] = data
+                    else:
+                        if data.get("method") == "Page.loadEventFired":
+                            target_id = self.sessions.get(data.get("sessionId"))
+                            if target_id:
+                                self.loaded_targets[target_id] = time.time()
+                        self.event_count += 1
+                        self.events.append((self.event_count, data))
+                    self.condition.notify_all()
+        except Exception as e:
+            logger.debug(f"DevTools connection closed: {e}")
+        
+    def send(self, method, params=None, session_id=None, timeout=10):
+        """Send a DevTools command and wait for its result"""
+        with self.condition:
+            self.next_id += 1
+            message_id = self.next_id
+        
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        self.connection.send(json.dumps(message))
+        
+        with self.condition:
+            if not self.condition.wait_for(lambda: message_id in self.responses, timeout):
+                raise TimeoutException(f"No DevTools response to {method}")
+            response = self.responses.pop(message_id)
+        
+        if "error" in response:
+            raise Exception(f"DevTools error for {method}: {response['error'].get('message')}")
+        return response.get("result", {})
+        
+    def mark(self):
+        """Return a position in the event stream; later waits only see newer events"""
+        with self.condition:
+            return self.event_count
+        
+    def wait_for_event(self, predicate, since, timeout):
+        """Wait for the first event after `since` that matches the predicate"""
+        deadline = time.time() + timeout
+        with self.condition:
+            while True:
+                for sequence, event in self.events:
+                    if sequence > since and predicate(event):
+                        return event
+                since = max(since, self.event_count)
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self.condition.wait(remaining)
+        
+    def wait_for_new_page(self, since, timeout=30):
+        """Wait for a new page target (tab or window) and return its target id"""
+        event = self.wait_for_event(
+            lambda e: e.get("method") == "Target.targetCreated" and e["params"]["targetInfo"]["type"] == "page",
+            since, timeout
+        )
+        return event["params"]["targetInfo"]["targetId"] if event else None
+        
+    def watch_page_load(self, target_id):
+        """Attach to a page target so that its load event is recorded"""
+        session_id = self.send("Target.attachToTarget", {"targetId": target_id, "flatten": True})["sessionId"]
+        with self.condition:
+            self.sessions[session_id] = target_id
+        self.send("Page.enable", session_id=session_id)
+        
+        # The page may have finished loading before Page.enable took effect
+        state = self.send("Runtime.evaluate", {
+            "expression": "document.readyState === 'complete' && location.href !== 'about:blank'",
+            "returnByValue": True
+        }, session_id=session_id)
+        if state.get("result", {}).get("value"):
+            with self.condition:
+                self.loaded_targets[target_id] = time.time()
+                self.condition.notify_all()
+        
+    def loaded_at(self, target_id):
+        """Time the target's page finished loading, or None if it has not"""
+        with self.condition:
+            return self.loaded_targets.get(target_id)
+        
+    def wait_for_load(self, target_ids, timeout=60):
+        """Return the first of the given targets whose page has loaded, or None on timeout"""
+        with self.condition:
+            self.condition.wait_for(lambda: any(t in self.loaded_targets for t in target_ids), timeout)
+            for target_id in target_ids:
+                if target_id in self.loaded_targets:
+                    return target_id
+        return None
+        
+    def forget_target(self, target_id):
+        """Drop the state kept for a closed target"""
+        with self.condition:
+            self.loaded_targets.pop(target_id, None)
+            for session_id in [s for s, t in self.sessions.items() if t == target_id]:
+                del self.sessions[session_id]
+        
+    def close(self):
+        """Close the DevTools connection"""
+        try:
+            self.connection.close()
+        except Exception as e:
+            logger.debug(f"Error closing DevTools connection: {e}")
+        if self.thread:
+            self.thread.join(timeout=5)
+
+class AsyncCdpConnection:
+    """Asyncio client for the browser-wide DevTools websocket, with flat sessions per page target"""
+    
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.next_id = 0
+        self.responses = {}  # message id -> future of the command result
+        self.waiters = []  # (method, session_id, predicate, future) of expected events
+        self.reader = asyncio.create_task(self._receive_loop())
+        
+    @classmethod
+    async def open(cls, debugger_address):
+        """Connect to the browser endpoint of a running Chrome"""
+        def websocket_url():
+            with urlopen(f"http://{debugger_address}/json/version", timeout=10) as response:
+                return json.loads(response.read().decode("utf-8"))["webSocketDebuggerUrl"]
+        
+        websocket = await async_websocket_connect(await asyncio.to_thread(websocket_url), max_size=None, open_timeout=10)
+        return cls(websocket)
+        
+    async def _receive_loop(self):
+        """Resolve command results and expected events until the connection closes"""
+        try:
+            async for message in self.websocket:
+                data = json.loads(message)
+                if "id" in data:
+                    future = self.responses.pop(data["id"], None)
+                    if future and not future.done():
+                        if "error" in data:
+                            future.set_exception(Exception(f"DevTools error: {data['error'].get('message')}"))
+                        else:
+                            future.set_result(data.get("result", {}))
+                    continue
+                
+                for waiter in list(self.waiters):
+                    method, session_id, predicate, future = waiter
+                    if future.done():
+                        self.waiters.remove(waiter)
+                    elif data.get("method") == method and (session_id is None or data.get("sessionId") == session_id) \
+                            and (predicate is None or predicate(data.get("params", {}))):
+                        self.waiters.remove(waiter)
+                        future.set_result(data.get("params", {}))
+        except Exception as e:
+            logger.debug(f"Async DevTools connection closed: {e}")
+        finally:
+            for future in self.responses.values():
+                if not future.done():
+                    future.set_exception(Exception("DevTools connection closed"))
+            # Nobody may be awaiting an expected event any more
+            for waiter in self.waiters:
+                waiter[3].cancel()
+        
+    async def send(self, method, params=None, session_id=None, timeout=30):
+        """Send a DevTools command and await its result"""
+        self.next_id += 1
+        message_id = self.next_id
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        
+        future = asyncio.get_running_loop().create_future()
+        self.responses[message_id] = future
+        try:
+            await self.websocket.send(json.dumps(message))
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.responses.pop(message_id, None)
+        
+    def expect(self, method, session_id=None, predicate=None):
+        """Future of the next matching event; register it before triggering the event"""
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append((method, session_id, predicate, future))
+        return future
+        
+    async def attach(self, target_id):
+        """Attach to a page target and return a page session"""
+        result = await self.send("Target.attachToTarget", {"targetId": target_id, "flatten": True})
+        page = AsyncCdpPage(self, target_id, result["sessionId"])
+        await page.send("Page.enable")
+        return page
+        
+    async def close(self):
+        await self.websocket.close()
+        await self.reader
+
+class AsyncCdpPage:
+    """One page target driven over a flat DevTools session"""
+    
+    def __init__(self, connection, target_id, session_id):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+        
+    async def send(self, method, params=None, timeout=30):
+        return await self.connection.send(method, params, self.session_id, timeout)
+        
+    def expect_load(self):
+        return self.connection.expect("Page.loadEventFired", self.session_id)
+        
+    async def evaluate(self, expression, timeout=30):
+        """Evaluate JavaScript in the page and return its value"""
+        result = await self.send("Runtime.evaluate", {
+            "expression": expression,
+            "returnByValue": True,
+            "awaitPromise": True
+        }, timeout)
+        if "exceptionDetails" in result:
+            raise Exception(f"Script error: {result['exceptionDetails'].get('text')}")
+        return result.get("result", {}).get("value")
+        
+    async def wait_for_load(self, load_event, timeout):
+        """Wait for a load event registered earlier, unless the page had already finished loading"""
+        if await self.evaluate("document.readyState") == "complete":
+            load_event.cancel()
+            return
+        await asyncio.wait_for(load_event, timeout)
+        
+    async def postback(self, expression, timeout):
+        """Run a script that reloads the page (an ASP.NET postback) and wait for the new page"""
+        load_event = self.expect_load()
+        await self.evaluate(expression)
+        await asyncio.wait_for(load_event, timeout)
+        
+    async def html(self):
+        return await self.evaluate("document.documentElement.outerHTML")
+        
+    async def print_to_pdf(self, timeout=120):
+        result = await self.send("Page.printToPDF", PDF_PRINT_PARAMS, timeout)
+        return base64.b64decode(result["data"])
+        
+    async def close(self):
+        await self.connection.send("Target.closeTarget", {"targetId": self.target_id})
+
+class CdpEventLoop:
+    """A background asyncio loop shared by every downloader using the DevTools backend"""
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="cdp-asyncio", daemon=True)
+        self.thread.start()
+        
+    @classmethod
+    def shared(cls):
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+        
+    def run(self, coroutine):
+        """Run a coroutine on the shared loop and wait for its result from a worker thread"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+# Patched chromedriver binaries, one per Chrome major version, shared by every process on the box
+CHROMEDRIVER_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "index2_downloader", "chromedriver")
+
+@functools.lru_cache(maxsize=None)
+def detect_chrome_major_version(chrome_path=None):
+    """Major version of the installed Chrome, or None if it cannot be determined"""
+    if sys.platform.startswith("win"):
+        # chrome.exe --version opens a window on Windows; the updater records the version instead
+        import winreg
+        for hive, key in ((winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon"),
+                          (winreg.HKEY_LOCAL_MACHINE, r"Software\Google\Chrome\BLBeacon")):
+            try:
+                with winreg.OpenKey(hive, key) as handle:
+                    return int(winreg.QueryValueEx(handle, "version")[0].split(".")[0])
+            except (OSError, ValueError):
+                continue
+        return None
+    
+    chrome_path = chrome_path or uc.find_chrome_executable()
+    if not chrome_path:
+        return None
+    try:
+        output = subprocess.run([chrome_path, "--version"], capture_output=True, text=True, timeout=30).stdout
+        match = re.search(r"(\d+)\.\d+\.\d+\.\d+", output)
+        return int(match.group(1)) if match else None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def is_patched_chromedriver(driver_path):
+    """Whether a chromedriver binary carries undetected-chromedriver's patch marker"""
+    try:
+        with open(driver_path, "rb") as f:
+            return f.read().find(b"undetected chromedriver") != -1
+    except OSError:
+        return False
+
+def cached_chromedriver(version_main):
+    """Path of a chromedriver patched for this Chrome version, patching it once under a file lock"""
+    version_dir = os.path.join(CHROMEDRIVER_CACHE_DIR, str(version_main))
+    os.makedirs(version_dir, exist_ok=True)
+    driver_path = os.path.join(version_dir, "chromedriver.exe" if sys.platform.startswith("win") else "chromedriver")
+    
+    # Only one process downloads and patches; the others wait and reuse its binary
+    with FileLock(os.path.join(version_dir, "patch.lock"), timeout=300):
+        if is_patched_chromedriver(driver_path):
+            return driver_path
+        
+        logger.info(f"Patching chromedriver for Chrome {version_main} into {version_dir}")
+        patcher = uc.Patcher(version_main=version_main)
+        patcher.auto()
+        partial_path = driver_path + ".partial"
+        shutil.copy2(patcher.executable_path, partial_path)
+        os.replace(partial_path, driver_path)
+        try:
+            os.remove(patcher.executable_path)
+        except OSError:
+            pass
+    return driver_path
+
+class BrowserProfileSlot:
+    """A persistent Chrome user-data directory leased by one worker at a time"""
+    
+    LOCK_FILE = "worker.lock"
+    CHROME_LOCKS = ("SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile")
+    
+    def __init__(self, root, max_slots=16):
+        self.root = root
+        self.max_slots = max_slots
+        self.path = None
+        
+    def acquire(self):
+        """Lease the first free profile directory, reclaiming ones whose worker has died"""
+        os.makedirs(self.root, exist_ok=True)
+        for slot in range(1, self.max_slots + 1):
+            path = os.path.join(self.root, f"worker-{slot}")
+            os.makedirs(path, exist_ok=True)
+            lock_path = os.path.join(path, self.LOCK_FILE)
+            
+            for _ in range(2):
+                try:
+                    fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                except FileExistsError:
+                    if self.lock_owner_alive(lock_path):
+                        break
+                    logger.info(f"Reclaiming browser profile {path} from a dead worker")
+                    try:
+                        os.remove(lock_path)
+                    except FileNotFoundError:
+                        pass
+                    continue
+                
+                with os.fdopen(fd, "w") as f:
+                    f.write(str(os.getpid()))
+                self.path = path
+                logger.info(f"Using browser profile {path}")
+                return path
+        
+        raise Exception(f"All {self.max_slots} browser profiles in {self.root} are in use")
+        
+    @staticmethod
+    def lock_owner_alive(lock_path):
+        try:
+            with open(lock_path) as f:
+                pid = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return False
+        # Profiles are leased per downloader, so this process may hold several
+        return pid == os.getpid() or psutil.pid_exists(pid)
+        
+    def release(self):
+        if not self.path:
+            return
+        try:
+            os.remove(os.path.join(self.path, self.LOCK_FILE))
+        except FileNotFoundError:
+            pass
+        self.path = None
+        
+    def clean_stale_locks(self):
+        """Remove Chrome's singleton locks left behind by a browser that did not exit cleanly"""
+        for name in self.CHROME_LOCKS:
+            lock_path = os.path.join(self.path, name)
+            if not os.path.lexists(lock_path):
+                continue
+            
+            # On Linux SingletonLock is a symlink to "<hostname>-<pid>"
+            if os.path.islink(lock_path):
+                match = re.search(r"-(\d+)$", os.readlink(lock_path))
+                pid = int(match.group(1)) if match else None
+                if pid and psutil.pid_exists(pid):
+                    # We hold the lease, so a Chrome still running on this profile is an orphan
+                    logger.warning(f"Killing orphaned Chrome {pid} still holding {self.path}")
+                    try:
+                        psutil.Process(pid).kill()
+                    except psutil.Error:
+                        pass
+            
+            try:
+                os.remove(lock_path)
+                logger.info(f"Removed stale Chrome lock {lock_path}")
+            except OSError as e:
+                logger.warning(f"Could not remove stale Chrome lock {lock_path}: {e}")
+        
+    def is_corrupted(self):
+        """Chrome's own state files must at least be valid JSON"""
+        for state_file in ("Local State", os.path.join("Default", "Preferences")):
+            state_path = os.path.join(self.path, state_file)
+            if not os.path.exists(state_path):
+                continue
+            try:
+                with open(state_path, encoding="utf-8") as f:
+                    json.load(f)
+            except (OSError, ValueError):
+                logger.warning(f"Browser profile file {state_path} is unreadable")
+                return True
+        return False
+        
+    def reset(self):
+        """Start the leased profile over from an empty directory, keeping the lease"""
+        logger.warning(f"Resetting browser profile {self.path}")
+        for name in os.listdir(self.path):
+            if name == self.LOCK_FILE:
+                continue
+            entry = os.path.join(self.path, name)
+            if os.path.isdir(entry) and not os.path.islink(entry):
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                try:
+                    os.remove(entry)
+                except OSError:
+                    pass
+        
+    def prepare(self):
+        """Make the leased profile safe to launch Chrome on"""
+        self.clean_stale_locks()
+        if self.is_corrupted():
+            self.reset()
+        return self.path
+
+class JobTimeoutError(Exception):
+    """Raised when a job exceeds its wall-clock limit and its browser was killed"""
+
+class BrowserSupervisor:
+    """Watch the process tree of one Chrome instance and decide when it must be recycled"""
+    
+    def __init__(self, max_rss_mb=2048, max_documents=200, responsiveness_timeout=30):
+        self.max_rss_mb = max_rss_mb  # Memory limit of chromedriver + Chrome + renderers
+        self.max_documents = max_documents  # Documents rendered before a routine restart
+        self.responsiveness_timeout = responsiveness_timeout  # Seconds a trivial script may take
+        self.processes = {}
+        self.documents = 0
+        
+    def attach(self, browser):
+        """Start tracking the chromedriver and Chrome processes of a freshly launched browser"""
+        self.processes = {}
+        self.documents = 0
+        root_pids = [getattr(browser, "browser_pid", None)]
+        service = getattr(browser, "service", None)
+        if service and getattr(service, "process", None):
+            root_pids.append(service.process.pid)
+        
+        for pid in root_pids:
+            if pid:
+                try:
+                    self.processes[pid] = psutil.Process(pid)
+                except psutil.Error:
+                    pass
+        self.refresh()
+        
+    def refresh(self):
+        """Add renderer and helper processes spawned since the last look"""
+        for process in list(self.processes.values()):
+            try:
+                for child in process.children(recursive=True):
+                    self.processes.setdefault(child.pid, child)
+            except psutil.Error:
+                pass
+        
+    def rss_mb(self):
+        """Resident memory of the whole process tree"""
+        self.refresh()
+        total = 0
+        for process in self.processes.values():
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        rss = total / (1024 * 1024)
+        BROWSER_RSS.set(rss)
+        return rss
+        
+    def is_responsive(self, browser):
+        """Whether chromedriver answers a trivial command in time (a wedged driver blocks forever)"""
+        answered = threading.Event()
+        
+        def ping():
+            try:
+                browser.execute_script("return 1")
+                answered.set()
+            except Exception:
+                pass
+        
+        threading.Thread(target=ping, daemon=True).start()
+        return answered.wait(self.responsiveness_timeout)
+        
+    def document_done(self):
+        self.documents += 1
+        
+    def recycle_reason(self, browser):
+        """Why the browser should be restarted before the next document, or None"""
+        rss = self.rss_mb()
+        if rss > self.max_rss_mb:
+            return f"memory ({rss:.0f} MB > {self.max_rss_mb} MB)"
+        if self.max_documents and self.documents >= self.max_documents:
+            return f"{self.documents} documents rendered"
+        if not self.is_responsive(browser):
+            return f"unresponsive for {self.responsiveness_timeout}s"
+        return None
+        
+    def kill_tree(self):
+        """Hard-kill every tracked process that is still running"""
+        self.refresh()
+        killed = 0
+        for process in self.processes.values():
+            try:
+                process.kill()
+                killed += 1
+            except psutil.Error:
+                pass
+        if killed:
+            logger.warning(f"Killed {killed} browser processes")
+        self.processes = {}
+        
+    @staticmethod
+    def kill_orphans(profile_root):
+        """Kill Chrome processes on our profiles whose launching process has died"""
+        profile_root = os.path.abspath(profile_root)
+        for process in psutil.process_iter(["pid", "ppid", "cmdline"]):
+            try:
+                cmdline = " ".join(process.info["cmdline"] or [])
+                if profile_root not in cmdline:
+                    continue
+                ppid = process.info["ppid"]
+                if ppid and ppid != 1 and psutil.pid_exists(ppid):
+                    continue
+                logger.warning(f"Killing orphaned Chrome process {process.pid}")
+                process.kill()
+                BROWSER_ORPHANS_KILLED.inc()
+            except psutil.Error:
+                pass
+
+IGR_SITE_URL = "https://freesearchigrservice.maharashtra.gov.in/"
+
+# Every downloader in this process (and, through the state file, on this machine) shares one breaker
+site_breaker = SiteCircuitBreaker(
+    IGR_SITE_URL,
+    state_path=os.path.join(tempfile.gettempdir(), "index2_site_breaker.json")
+)
+
 class Index2Downloader:
-    def __init__(self, headless=False, downloads_path="downloads"):
+    def __init__(self, headless=False, downloads_path="downloads", max_tabs=4, trace=False, profile=False, park_timeout=0,
+                 render_mode="inline", render_workers=2, compact_pdfs=True, bundle_documents=False, network_policy="lean",
+                 persistent_profile=True, disk_cache_mb=256, max_browser_rss_mb=2048, max_documents_per_browser=200,
+                 job_timeout=3600, backend="selenium", hedge_searches=True, autoscale=True):
         self.downloads_path = downloads_path
         self.browser = None
-        self.headless = False  # Always set to False to show browser
+        self.cdp_events = None
+        self.headless = headless
         self.current_property_number = None
+        self.search_location = None
+        self.results_page = 1
+        self.total_pages = None  # Known once the pager shows the last page
+        self.max_tabs = max_tabs  # Report tabs rendered concurrently per browser
+        self.trace = trace or profile  # Write a trace timeline for every job
+        self.profile = profile  # Also capture cProfile/tracemalloc hotspots
+        self.park_timeout = park_timeout  # Seconds to wait for the site to recover instead of failing fast
+        self.render_mode = render_mode  # "inline" prints in the scraping browser, "snapshot" renders offline
+        self.render_workers = render_workers  # Size of the shared offline renderer pool
+        self.pending_renders = []
+        self.compact_pdfs = compact_pdfs  # Recompress each PDF before it is uploaded
+        self.bundle_documents = bundle_documents  # Also merge a property's documents into one bookmarked PDF
+        self.network_policy = network_policy  # "lean" blocks images, fonts and trackers on search pages, "full" loads everything
+        self.page_weight = {}  # Bytes and load time of each page of the current search
+        self.persistent_profile = persistent_profile  # Keep cookies and the HTTP cache between launches
+        self.disk_cache_mb = disk_cache_mb  # Size limit of the profile's HTTP disk cache
+        self.profile_slot = None
+        self.supervisor = BrowserSupervisor(max_browser_rss_mb, max_documents_per_browser)
+        self.job_timeout = job_timeout  # Hard wall-clock limit per job in seconds (0 disables it)
+        self.job_timed_out = False
+        self.job_time_left = job_timeout
+        self.watchdog = None
+        self.watchdog_started = None
+        self.last_search = None  # Parameters of the search on screen, replayed after a browser restart
+        self.launch_timings = None  # Seconds spent preparing chromedriver and starting Chrome at the last launch
+        self.backend = backend  # "cdp" renders harvested reports over DevTools on a shared asyncio loop
+        self.hedge_searches = hedge_searches  # Copy searches slower than the learned p95 to a second session
+        self.search_cancelled = threading.Event()  # Set when another session already answered this search
+        self.scheduler = JobScheduler.shared()  # Browser capacity is shared by priority class across downloaders
+        self.job_priority = "interactive"
+        self.holding_slot = False
+        self.command_stats = WebDriverCommandStats()  # Reset at the start of every job
+        
+        # Observed site latency drives timeouts and retry spacing
+        self.latency = LatencyModel.shared(os.path.join(self.downloads_path, "latency_model.json"))
+        
+        # Size the browser pool to the queue instead of a fixed worker count
+        if autoscale:
+            PoolAutoscaler.shared(self.latency).start()
         
         # Create downloads directory if it doesn't exist
         os.makedirs(self.downloads_path, exist_ok=True)
         
+        # The SQLite stores below are opened on first use, keeping construction cheap
+        self.search_key = None
+        
         # Configure OCR options
         self.tesseract_config = '--oem 1 --psm 7'
         
-        self.drive_service = self.initialize_drive()
         self.drive_folder_id = '1yT_M8b4_VTFZ0X4ggRJTxhRm5QYLp3E9'  # Replace with your folder ID
         
+    @property
+    def search_cache(self):
+        """Repeated searches are answered from here"""
+        return SearchResultCache.shared(os.path.join(self.downloads_path, "search_cache.sqlite3"))
+        
+    @property
+    def watch_store(self):
+        """Registrations already seen per watched property"""
+        return PropertyWatchStore.shared(os.path.join(self.downloads_path, "watch.sqlite3"))
+        
+    @property
+    def reports_db(self):
+        """Fields extracted from every downloaded report"""
+        return IndexIIDatabase.shared(os.path.join(self.downloads_path, "indexii.sqlite3"))
+        
     def initialize(self):
         """Initialize the browser with undetected-chromedriver"""
+        # Don't spend a Chrome process on a site that is down
+        site_breaker.check(self.park_timeout)
+        
         logger.info("Initializing browser...")
         
         try:
-            # Setup Chrome options
-            options = uc.ChromeOptions()
-            options.add_argument("--headless")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--remote-debugging-port=9222")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-            # Remove headless argument
-            options.add_argument("--window-size=1920,1080")
-            options.add_argument("--disable-extensions")
-            options.add_argument("--disable-popup-blocking")
-            options.add_argument("--disable-infobars")
-            
-            # Configure download settings
-            prefs = {
-                "download.default_directory": os.path.abspath(self.downloads_path),
-                "download.prompt_for_download": False,
-                "plugins.always_open_pdf_externally": True,
-                "download.open_pdf_in_system_reader": False,
-                "printing.print_preview_sticky_settings.appState": json.dumps({
-                    "recentDestinations": [{
-                        "id": "Save as PDF",
-                        "origin": "local",
-                        "account": "",
-                    }],
-                    "selectedDestinationId": "Save as PDF",
-                    "version": 2
-                })
-            }
-            options.add_experimental_option("prefs", prefs)
-            
-            # Initialize the browser with undetected-chromedriver
-            logger.info("Creating undetected Chrome browser...")
-            self.browser = uc.Chrome(options=options)
-            
-            # Set very long timeout for slow government websites (5 minutes)
-            self.browser.set_page_load_timeout(300)
-            
-            logger.info("Browser initialized successfully")
-            return True
+            # Chrome left running by a worker that died would hold memory and profile locks
+            BrowserSupervisor.kill_orphans(os.path.join(self.downloads_path, "browser_profiles"))
+            
+            # Reuse this worker's profile so the site's static assets come from the disk cache
+            user_data_dir = self.acquire_profile() if self.persistent_profile else None
+            
+            # Reuse the chromedriver already patched for this Chrome version
+            driver_start = time.time()
+            driver_args = self.chromedriver_args()
+            driver_seconds = time.time() - driver_start
+            
+            # Initialize the browser with undetected-chromedriver
+            logger.info(f"Creating undetected Chrome browser ({'headless' if self.headless else 'visible'})...")
+            chrome_start = time.time()
+            try:
+                self.browser = uc.Chrome(options=self.chrome_options(), user_data_dir=user_data_dir, **driver_args)
+            except Exception as launch_error:
+                if not user_data_dir:
+                    raise
+                # A profile Chrome cannot start on is treated as corrupted
+                logger.warning(f"Chrome failed to start on profile {user_data_dir}: {launch_error}")
+                self.profile_slot.reset()
+                self.browser = uc.Chrome(options=self.chrome_options(), user_data_dir=user_data_dir, **driver_args)
+            
+            chrome_seconds = time.time() - chrome_start
+            self.launch_timings = {"chromedriver": round(driver_seconds, 3), "chrome": round(chrome_seconds, 3)}
+            BROWSER_LAUNCH_SECONDS.labels(phase='chromedriver').observe(driver_seconds)
+            BROWSER_LAUNCH_SECONDS.labels(phase='chrome').observe(chrome_seconds)
+            logger.info(f"Browser launched in {driver_seconds + chrome_seconds:.2f}s (chromedriver {driver_seconds:.2f}s, Chrome {chrome_seconds:.2f}s)")
+            
+            self.supervisor.attach(self.browser)
+            
+            # Set very long timeout for slow government websites (5 minutes until the site's latency is known)
+            self.browser.set_page_load_timeout(self.latency.timeout('page_load', 300))
+            
+            self.instrument_browser()
+            self.start_cdp_events()
+            
+            logger.info("Browser initialized successfully")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error initializing browser: {e}")
+            raise Exception(f"Failed to initialize browser: {e}")
+    
+    def chrome_options(self):
+        """Chrome options for the scraping browser (uc does not allow reusing them across launches)"""
+        # Setup Chrome options
+        options = uc.ChromeOptions()
+        if self.headless:
+            options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--remote-debugging-port=9222")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-popup-blocking")
+        options.add_argument("--disable-infobars")
+        
+        # Configure download settings
+        prefs = {
+            "download.default_directory": os.path.abspath(self.downloads_path),
+            "download.prompt_for_download": False,
+            "plugins.always_open_pdf_externally": True,
+            "download.open_pdf_in_system_reader": False,
+            "printing.print_preview_sticky_settings.appState": json.dumps({
+                "recentDestinations": [{
+                    "id": "Save as PDF",
+                    "origin": "local",
+                    "account": "",
+                }],
+                "selectedDestinationId": "Save as PDF",
+                "version": 2
+            })
+        }
+        options.add_experimental_option("prefs", prefs)
+        
+        if self.profile_slot:
+            # Cap the profile's HTTP cache so it cannot grow without bound
+            options.add_argument(f"--disk-cache-size={self.disk_cache_mb * 1024 * 1024}")
+        
+        return options
+        
+    def chromedriver_args(self):
+        """uc.Chrome arguments pointing at the cached patched chromedriver, or none to let uc patch its own"""
+        try:
+            version_main = detect_chrome_major_version()
+            if not version_main:
+                logger.warning("Could not determine the Chrome version, letting undetected-chromedriver resolve the driver")
+                return {}
+            return {"driver_executable_path": cached_chromedriver(version_main), "version_main": version_main}
+        except Exception as e:
+            logger.warning(f"Chromedriver cache unavailable, letting undetected-chromedriver resolve the driver: {e}")
+            return {}
+    
+    def acquire_profile(self):
+        """Lease a persistent profile directory for this downloader and make it launchable"""
+        if not self.profile_slot:
+            self.profile_slot = BrowserProfileSlot(os.path.join(self.downloads_path, "browser_profiles"))
+            self.profile_slot.acquire()
+        return self.profile_slot.prepare()
+    
+    def instrument_browser(self):
+        """Route every WebDriver command through the job tracer and command accounting"""
+        # Re-instrumenting (after a browser changes hands) replaces the previous wrapper
+        execute = getattr(self.browser, "uninstrumented_execute", self.browser.execute)
+        self.browser.uninstrumented_execute = execute
+        
+        # Element methods (find_element, get_attribute, text, ...) also go through the driver's execute
+        def instrumented_execute(driver_command, params=None):
+            call_site = find_call_site()
+            tracer = current_tracer()
+            start_time = time.perf_counter()
+            try:
+                if tracer:
+                    with tracer.span(driver_command, "webdriver", call_site=call_site):
+                        return execute(driver_command, params)
+                return execute(driver_command, params)
+            finally:
+                duration = time.perf_counter() - start_time
+                self.command_stats.record(call_site, driver_command, duration)
+                WEBDRIVER_COMMAND_DURATION.labels(command=driver_command).observe(duration)
+                WEBDRIVER_CALL_SITE_COMMANDS.labels(call_site=call_site).inc()
+        
+        self.browser.execute = instrumented_execute
+    
+    def apply_network_policy(self, block=True):
+        """Block (or stop blocking) resources the automation never needs in the current tab"""
+        if self.network_policy != "lean":
+            return
+        
+        patterns = BLOCKED_URL_PATTERNS if block else []
+        try:
+            self.browser.execute_cdp_cmd("Network.enable", {})
+            self.browser.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            logger.info(f"Blocking {len(patterns)} URL patterns in the current tab")
+        except Exception as e:
+            logger.warning(f"Could not apply network policy: {e}")
+    
+    def measure_page_weight(self, page):
+        """Record bytes transferred and load time of the page on screen from the Resource Timing API"""
+        try:
+            weight = self.browser.execute_script("""
+                const nav = performance.getEntriesByType('navigation')[0];
+                const resources = performance.getEntriesByType('resource');
+                return {
+                    bytes: (nav ? nav.transferSize : 0) + resources.reduce((total, r) => total + (r.transferSize || 0), 0),
+                    requests: resources.length + 1,
+                    load_seconds: nav && nav.loadEventEnd ? nav.loadEventEnd / 1000 : null
+                };
+            """)
+        except Exception as e:
+            logger.warning(f"Could not measure {page} page weight: {e}")
+            return None
+        
+        weight["network_policy"] = self.network_policy
+        self.page_weight[page] = weight
+        PAGE_BYTES.labels(page=page, network_policy=self.network_policy).observe(weight["bytes"])
+        if weight["load_seconds"] is not None:
+            PAGE_LOAD_SECONDS.labels(page=page, network_policy=self.network_policy).observe(weight["load_seconds"])
+        logger.info(f"{page} page: {weight['bytes']} bytes in {weight['requests']} requests, loaded in {weight['load_seconds']}s ({self.network_policy} policy)")
+        return weight
+    
+    def sleep(self, seconds):
+        """Sleep, recording the pause in the job trace"""
+        tracer = current_tracer()
+        if tracer:
+            with tracer.span("sleep", "sleep", seconds=seconds):
+                time.sleep(seconds)
+        else:
+            time.sleep(seconds)
+    
+    def start_cdp_events(self):
+        """Connect a DevTools event listener to the browser, falling back to polling if unavailable"""
+        try:
+            debugger_address = self.browser.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+            if not debugger_address:
+                raise Exception("Browser did not report a debugger address")
             
+            self.cdp_events = CdpEventListener(debugger_address)
+            self.cdp_events.start()
         except Exception as e:
-            logger.error(f"Error initializing browser: {e}")
-            raise Exception(f"Failed to initialize browser: {e}")
+            logger.warning(f"DevTools events unavailable, falling back to polling: {e}")
+            self.cdp_events = None
         
+    @timed_stage('navigate_to_search_page')
     def navigate_to_search_page(self):
         """Navigate to the search page with extended waiting"""
         logger.info("Navigating to search page...")
         
-        url = "https://freesearchigrservice.maharashtra.gov.in/"
+        url = IGR_SITE_URL
         
-        # Add retry logic with exponential backoff
+        # Add retry logic with exponential backoff, spaced by the site's typical page load time
         max_retries = 3
-        retry_delay = 10  # Initial delay in seconds
-        max_delay = 60  # Maximum delay between retries
+        retry_delay = self.latency.retry_delay('page_load', 10)  # Initial delay in seconds
+        max_delay = retry_delay * 6  # Maximum delay between retries
         
         for retry in range(max_retries):
+            # Stop retrying as soon as any worker has declared the site down
+            if retry > 0:
+                site_breaker.check()
+            
             try:
                 logger.info(f"Attempting to load {url} (Attempt {retry+1}/{max_retries})")
+                if retry > 0:
+                    STAGE_RETRIES.labels(stage='navigate_to_search_page').inc()
                 
-                # Set timeout for page load
-                self.browser.set_page_load_timeout(120)  # 2 minutes
+                # Set timeout for page load (2 minutes until the site's latency is known)
+                page_load_timeout = self.latency.timeout('page_load', 120)
+                self.browser.set_page_load_timeout(page_load_timeout)
                 
                 # Use get with extended timeout
-                self.browser.get(url)
+                load_started = time.time()
+                try:
+                    self.browser.get(url)
+                except TimeoutException:
+                    self.latency.observe('page_load', page_load_timeout)
+                    raise
+                self.latency.observe('page_load', time.time() - load_started)
                 
                 # Display message to user about waiting
                 logger.info("Page is loading. Government websites can be slow - please wait...")
                 
                 # Wait with increasing intervals to allow the page to fully load
-                for i in range(1, 13):  # 12 checks over 1 minute
-                    time.sleep(5)  # 5-second intervals
-                    logger.info(f"Still waiting for page to load... ({i*5}s)")
+                for i in range(1, 13):  # 12 checks
+                    settle = self.latency.retry_delay('page_load', 5, minimum=1)  # Up to 5s, less once the site is known to be fast
+                    self.sleep(settle)
+                    logger.info(f"Still waiting for page to load... ({i*settle:.0f}s)")
                     
                     # Check if page has loaded enough to proceed
                     page_ready = self.browser.execute_script("""
@@ -139,7 +2463,7 @@ class Index2Downloader:
                         logger.info("Page appears to be ready, checking for elements...")
                         
                     try:
-                        close_button = WebDriverWait(self.browser, 10).until(
+                        close_button = WebDriverWait(self.browser, self.latency.timeout('element', 10)).until(
                             EC.element_to_be_clickable((By.CSS_SELECTOR, "a.btnclose.btn.btn-danger"))
                         )
                         close_button.click()
@@ -155,7 +2479,7 @@ class Index2Downloader:
                 # Check if there's any error message on the page
                 if "ERR_NAME_NOT_RESOLVED" in self.browser.page_source or "can't be reached" in self.browser.page_source:
                     logger.warning("Error page detected, retrying...")
-                    time.sleep(retry_delay)
+                    self.sleep(retry_delay)
                     retry_delay = min(retry_delay * 2, max_delay)  # Exponential backoff
                     continue
                 
@@ -166,18 +2490,22 @@ class Index2Downloader:
                 
                 # Try to find and click the button
                 try:
-                    # Wait up to 20 seconds for the button to be clickable
-                    maharashtra_button = WebDriverWait(self.browser, 20).until(
+                    # Wait for the button to be clickable (20 seconds until the site's latency is known)
+                    element_started = time.time()
+                    maharashtra_button = WebDriverWait(self.browser, self.latency.timeout('element', 20)).until(
                         EC.element_to_be_clickable((By.ID, "btnOtherdistrictSearch"))
                     )
+                    self.latency.observe('element', time.time() - element_started)
                     logger.info("Found Rest of Maharashtra button, clicking it...")
                     maharashtra_button.click()
                     
-                    # Wait for the form to load after clicking
+                    # Wait for the form to load after clicking (30 seconds until the site's latency is known)
                     logger.info("Waiting for form to load after clicking button...")
-                    WebDriverWait(self.browser, 30).until(
+                    form_started = time.time()
+                    WebDriverWait(self.browser, self.latency.timeout('form_load', 30)).until(
                         EC.presence_of_element_located((By.ID, "ddlFromYear1"))
                     )
+                    self.latency.observe('form_load', time.time() - form_started)
                     
                     logger.info("Search form loaded successfully")
                     return True
@@ -191,7 +2519,7 @@ class Index2Downloader:
                         
                         # Wait for form to load
                         logger.info("Waiting for form after JavaScript click...")
-                        time.sleep(10)
+                        self.sleep(self.latency.typical('form_load', 10))
                         
                         # Check if form is loaded
                         form_element = self.browser.find_element(By.ID, "ddlFromYear1")
@@ -203,12 +2531,12 @@ class Index2Downloader:
                 
                 # First, try to find and click the Close button if it exists
                 try:
-                    close_button = WebDriverWait(self.browser, 10).until(
+                    close_button = WebDriverWait(self.browser, self.latency.timeout('element', 10)).until(
                         EC.element_to_be_clickable((By.CSS_SELECTOR, "a.btnclose.btn.btn-danger"))
                     )
                     logger.info("Found Close button, clicking it...")
                     close_button.click()
-                    time.sleep(2)  # Wait for the close action to complete
+                    self.sleep(2)  # Wait for the close action to complete
                 except Exception as close_error:
                     logger.info("Close button not found or not clickable, proceeding...")
             
@@ -216,7 +2544,7 @@ class Index2Downloader:
                 logger.warning(f"Timeout occurred on attempt {retry+1}")
                 if retry < max_retries - 1:
                     logger.info(f"Waiting {retry_delay} seconds before retrying...")
-                    time.sleep(retry_delay)
+                    self.sleep(retry_delay)
                     retry_delay = min(retry_delay * 2, max_delay)  # Exponential backoff
                     continue
                 else:
@@ -227,7 +2555,7 @@ class Index2Downloader:
                 logger.error(f"Error on attempt {retry+1}: {e}")
                 if retry < max_retries - 1:
                     logger.info(f"Waiting {retry_delay} seconds before retrying...")
-                    time.sleep(retry_delay)
+                    self.sleep(retry_delay)
                     retry_delay = min(retry_delay * 2, max_delay)  # Exponential backoff
                     continue
                 else:
@@ -257,6 +2585,10 @@ class Index2Downloader:
             logger.warning(f"Error getting options for {select_element_id}: {e}")
             return {}
     
+    def settle_form(self, default):
+        """Pause after a form change for the site's typical dropdown postback, at most the old fixed delay"""
+        self.sleep(self.latency.retry_delay('dropdown', default, minimum=1))
+
     def select_first_option(self, select_element_id):
         """Select the first non-empty option in a dropdown and return its value"""
         try:
@@ -325,9 +2657,11 @@ class Index2Downloader:
         
         raise Exception("Captcha element not found")
     
+    @timed_stage('solve_captcha')
     def solve_captcha(self):
         """Solve the captcha using OCR"""
         logger.info("Attempting to solve captcha...")
+        CAPTCHA_ATTEMPTS.inc()
         
         try:
             # Find captcha element
@@ -365,6 +2699,7 @@ class Index2Downloader:
             logger.error(f"Error solving captcha: {e}")
             raise
     
+    @timed_stage('fill_search_form')
     def fill_search_form(self, year, district_name, taluka_name, village_name, property_number):
         """Fill the search form with the provided parameters using names instead of codes"""
         self.current_property_number = property_number
@@ -375,7 +2710,7 @@ class Index2Downloader:
             logger.info(f"Selecting year: {year}")
             year_dropdown = Select(self.browser.find_element(By.ID, "ddlFromYear1"))
             year_dropdown.select_by_value(str(year))
-            time.sleep(3)  # Wait after year selection
+            self.settle_form(3)  # Wait after year selection
             
             # Select District by name
             logger.info(f"Selecting district: {district_name}")
@@ -404,14 +2739,16 @@ class Index2Downloader:
                 logger.warning(f"District '{district_name}' not found. Selecting first available district.")
                 self.select_first_option("ddlDistrict1")
             
-            time.sleep(3)  # Wait after district selection
+            self.settle_form(3)  # Wait after district selection
             
             # Wait for taluka dropdown to populate
             logger.info("Waiting for taluka dropdown to populate...")
-            WebDriverWait(self.browser, 30).until(
+            dropdown_started = time.time()
+            WebDriverWait(self.browser, self.latency.timeout('dropdown', 30)).until(
                 lambda d: len(Select(d.find_element(By.ID, "ddltahsil")).options) > 1
             )
-            time.sleep(3)  # Wait after taluka dropdown populates
+            self.latency.observe('dropdown', time.time() - dropdown_started)
+            self.settle_form(3)  # Wait after taluka dropdown populates
             
             # Select Taluka by name
             logger.info(f"Selecting taluka: {taluka_name}")
@@ -440,14 +2777,16 @@ class Index2Downloader:
                 logger.warning(f"Taluka '{taluka_name}' not found. Selecting first available taluka.")
                 self.select_first_option("ddltahsil")
             
-            time.sleep(3)  # Wait after taluka selection
+            self.settle_form(3)  # Wait after taluka selection
             
             # Wait for village dropdown to populate
             logger.info("Waiting for village dropdown to populate...")
-            WebDriverWait(self.browser, 30).until(
+            dropdown_started = time.time()
+            WebDriverWait(self.browser, self.latency.timeout('dropdown', 30)).until(
                 lambda d: len(Select(d.find_element(By.ID, "ddlvillage")).options) > 1
             )
-            time.sleep(3)  # Wait after village dropdown populates
+            self.latency.observe('dropdown', time.time() - dropdown_started)
+            self.settle_form(3)  # Wait after village dropdown populates
             
             # Select Village by name
             logger.info(f"Selecting village: {village_name}")
@@ -476,14 +2815,14 @@ class Index2Downloader:
                 logger.warning(f"Village '{village_name}' not found. Selecting first available village.")
                 self.select_first_option("ddlvillage")
             
-            time.sleep(10)  # Wait after village selection
+            self.settle_form(10)  # Wait after village selection
             
             # Enter Property Number
             logger.info(f"Entering property number: {property_number}")
             property_input = self.browser.find_element(By.ID, "txtAttributeValue1")
             property_input.clear()
             property_input.send_keys(str(property_number))
-            time.sleep(3)  # Wait after entering property number
+            self.settle_form(3)  # Wait after entering property number
             
             # Handle Captcha with automatic OCR
             logger.info("Handling captcha...")
@@ -492,7 +2831,7 @@ class Index2Downloader:
             captcha_input = self.browser.find_element(By.ID, "txtImg1")
             captcha_input.clear()
             captcha_input.send_keys(captcha_text)
-            time.sleep(3)  # Wait after entering captcha
+            self.settle_form(3)  # Wait after entering captcha
             
             logger.info("Search form filled successfully")
             return True
@@ -501,15 +2840,25 @@ class Index2Downloader:
             self.browser.save_screenshot(os.path.join(self.downloads_path, "form_fill_error.png"))
             raise
     
-    def submit_search_form(self, max_attempts=3):
-        """Submit the search form and wait for results with multiple attempts"""
+    def check_search_cancelled(self):
+        """Stop a hedge copy before it sends the site more work for a search already answered"""
+        if self.search_cancelled.is_set():
+            raise SearchCancelledError("Search answered by another session")
+
+    @timed_stage('submit_search_form')
+    def submit_search_form(self, max_attempts=3, max_captcha_retries=5):
+        """Submit the search form, classify the response and act on it"""
         logger.info("Submitting search form...")
         
         attempt = 0
+        captcha_retries = 0
+        backoff = self.latency.retry_delay('search', 10)  # Initial delay before retrying a failed search
         while attempt < max_attempts:
             try:
                 attempt += 1
                 logger.info(f"Attempt {attempt}/{max_attempts}")
+                if attempt > 1:
+                    STAGE_RETRIES.labels(stage='submit_search_form').inc()
                 
                 # Verify property number is still entered
                 property_input = self.browser.find_element(By.ID, "txtAttributeValue1")
@@ -525,6 +2874,10 @@ class Index2Downloader:
                     captcha_input.clear()
                     captcha_input.send_keys(captcha_text)
                 
+                # Responses to earlier attempts must not be taken for the answer to this one
+                self.mark_stale_search_response()
+                self.check_search_cancelled()
+                
                 # Locate the search button
                 try:
                     search_button = self.browser.find_element(By.ID, "btnSearch_RestMaha")
@@ -568,106 +2921,49 @@ class Index2Downloader:
                                 raise Exception("No search button found and no results displayed")
                             continue
                 
-                # Wait 20 seconds after clicking search button
-                logger.info("Waiting 10 seconds for initial processing...")
-                time.sleep(10)
-                
-                # Check if new captcha appears
-                if self.is_new_captcha_present():
-                    logger.info("New captcha detected, solving it...")
-                    self.solve_and_submit_new_captcha()
-                
-                # Wait for loading indicator to appear
-                logger.info("Waiting for loading indicator to appear...")
-                try:
-                    WebDriverWait(self.browser, 10).until(
-                        EC.presence_of_element_located((By.XPATH, "//img[@src='Images/ajax-loader1.gif']"))
-                    )
-                    logger.info("Loading indicator appeared")
-                except TimeoutException:
-                    logger.warning("Loading indicator did not appear within timeout")
-                
-                # Wait for loading indicator to disappear
-                logger.info("Waiting for loading to complete...")
-                try:
-                    WebDriverWait(self.browser, 120).until(
-                        EC.invisibility_of_element_located((By.XPATH, "//img[@src='Images/ajax-loader1.gif']"))
-                    )
-                    logger.info("Loading indicator disappeared")
-                except TimeoutException:
-                    logger.warning("Loading indicator did not disappear within timeout")
+                search_started = time.time()
+                outcome, state = self.wait_for_search_response()
+                self.latency.observe('search', time.time() - search_started)
+                SEARCH_OUTCOMES.labels(outcome=outcome).inc()
+                logger.info(f"Search response: {outcome}" + (f" ({'; '.join(state['errors'])})" if state.get("errors") else ""))
                 
-                # Wait for results or error message
-                logger.info("Waiting for search results to load...")
-                try:
-                    WebDriverWait(self.browser, 30).until(
-                        lambda d: (
-                            d.find_elements(By.ID, "RegistrationGrid") or 
-                            d.find_elements(By.CSS_SELECTOR, "span[style*='color:Red']") or
-                            d.find_elements(By.CSS_SELECTOR, "input[value='IndexII']")  # Direct check for IndexII buttons
-                        )
-                    )
-                except TimeoutException:
-                    logger.warning("Timeout waiting for results, checking page state...")
-                    self.browser.save_screenshot(os.path.join(self.downloads_path, f"timeout_state_attempt_{attempt}.png"))
-                    continue  # Try again if timeout occurs
-
                 # Take a screenshot of results page
                 self.browser.save_screenshot(os.path.join(self.downloads_path, f"search_results_attempt_{attempt}.png"))
                 
-                # Check for error messages more thoroughly
-                error_elements = self.browser.find_elements(By.CSS_SELECTOR, "span[style*='color:Red']")
-                if error_elements:
-                    error_texts = [e.text.strip() for e in error_elements if e.text.strip()]
-                    if error_texts:
-                        logger.error(f"Search error: {', '.join(error_texts)}")
-                        
-                        # Look for IndexII buttons even with errors
-                        index2_buttons = self.browser.find_elements(By.CSS_SELECTOR, "input[value='IndexII']")
-                        if index2_buttons:
-                            logger.info(f"Found {len(index2_buttons)} IndexII buttons despite error message")
-                            return True
-                        
-                        # Handle specific error codes
-                        if "1259" in error_texts[0]:
-                            logger.info("Error 1259 detected, attempting to refresh captcha...")
-                            self.handle_error_1259()
-                            continue  # Try again after handling error
-                        
-                        # Handle error 3046 specifically
-                        if "3046" in error_texts[0]:
-                            logger.info("Error 3046 detected, checking for IndexII buttons anyway...")
-                            # Look for IndexII buttons
-                            index2_buttons = self.browser.find_elements(By.CSS_SELECTOR, "input[value='IndexII']")
-                            if index2_buttons:
-                                logger.info(f"Found {len(index2_buttons)} IndexII buttons despite error 3046")
-                                return True
-                        
-                        continue  # Try again for other errors
-                
-                # Check if we have results
-                try:
-                    # First check for IndexII buttons directly
-                    index2_buttons = self.browser.find_elements(By.CSS_SELECTOR, "input[value='IndexII']")
-                    if index2_buttons:
-                        logger.info(f"Found {len(index2_buttons)} IndexII buttons")
-                        return True
-                    
-                    # Then check for results table
-                    results_table = self.browser.find_element(By.ID, "RegistrationGrid")
-                    rows = results_table.find_elements(By.TAG_NAME, "tr")
-                    
-                    if len(rows) <= 1:
-                        logger.error("No search results found (empty table)")
-                        continue  # Try again if no results
-                    
-                    logger.info(f"Found {len(rows)-1} search results in table")
+                if outcome == "results":
+                    logger.info(f"Found {state['indexii'] or state['grid_rows'] - 1} search results")
                     return True
-                    
-                except Exception as e:
-                    logger.error(f"Error checking search results: {e}")
-                    continue  # Try again if error occurs
                 
+                # The site answered that there is nothing to find; asking again cannot change that
+                if outcome in ("no_results", "error_3046"):
+                    if outcome == "error_3046":
+                        SEARCH_ERRORS.labels(code='3046').inc()
+                    raise NoSearchResultsError(f"No records found for property {self.current_property_number}", outcome)
+                
+                # A fresh captcha fixes these right away, without using up a search attempt
+                if outcome in ("wrong_captcha", "captcha_reset"):
+                    if captcha_retries < max_captcha_retries:
+                        captcha_retries += 1
+                        attempt -= 1
+                    if outcome == "wrong_captcha":
+                        SEARCH_ERRORS.labels(code='1259').inc()
+                        self.handle_error_1259()
+                    continue
+                
+                # Server errors, unknown site errors and timeouts: back off, then search again
+                logger.warning(f"Search attempt {attempt} failed ({outcome})")
+                self.browser.save_screenshot(os.path.join(self.downloads_path, f"{outcome}_attempt_{attempt}.png"))
+                if attempt < max_attempts:
+                    logger.info(f"Backing off {backoff:.0f} seconds before retrying")
+                    self.sleep(backoff)
+                    backoff = min(backoff * 2, 120)
+                    if not state.get("has_form") and self.last_search:
+                        self.navigate_to_search_page()
+                        self.fill_search_form(*self.last_search)
+                continue
+                
+            except (NoSearchResultsError, SearchCancelledError):
+                raise
             except Exception as e:
                 logger.error(f"Error in attempt {attempt}: {e}")
                 self.browser.save_screenshot(os.path.join(self.downloads_path, f"search_error_attempt_{attempt}.png"))
@@ -683,32 +2979,166 @@ class Index2Downloader:
         logger.error(f"Failed after {max_attempts} attempts")
         raise Exception(f"Could not complete search after {max_attempts} attempts")
     
-    def is_loading_complete(self):
-        """Check if page loading is complete"""
+    def mark_stale_search_response(self):
+        """Tag the error messages and grid currently on the page so they are ignored after the next submit"""
         try:
-            return self.browser.execute_script("""
-                return document.readyState === 'complete' && 
-                       !document.querySelector('.loading-indicator') &&
-                       !document.querySelector('.spinner');
+            self.browser.execute_script("""
+                document.querySelectorAll("span[style*='color:Red'], span[style*='color:red'], #RegistrationGrid, input[value='IndexII']")
+                    .forEach(element => element.setAttribute('data-index2-stale', '1'));
             """)
-        except:
-            return True
+        except Exception as e:
+            logger.debug(f"Could not mark stale search response: {e}")
+    
+    def read_search_state(self):
+        """Everything the response classifier looks at, read in one script call"""
+        return self.browser.execute_script("""
+            const fresh = selector => Array.from(document.querySelectorAll(selector))
+                .filter(element => !element.closest('[data-index2-stale]'));
+            const visible = element => !!element && element.offsetParent !== null;
+            const grid = fresh('#RegistrationGrid')[0];
+            const captchaInput = document.getElementById('txtImg1');
+            const text = (document.title || '') + ' ' + (document.body ? document.body.innerText.slice(0, 3000) : '');
+            return {
+                errors: fresh("span[style*='color:Red'], span[style*='color:red']")
+                    .map(element => element.innerText.trim()).filter(Boolean),
+                indexii: fresh("input[value='IndexII']").length,
+                grid_rows: grid ? grid.querySelectorAll('tr').length : null,
+                loading: visible(document.querySelector("img[src='Images/ajax-loader1.gif']")),
+                captcha_empty: visible(document.getElementById('imgCaptcha_new')) && !!captchaInput && !captchaInput.value,
+                has_form: !!document.getElementById('btnSearch_RestMaha'),
+                server_error: /Server Error in|Runtime Error|Service Unavailable|Internal Server Error|Bad Gateway|Gateway Time-?out|HTTP Error 50\d/i.test(text)
+            };
+        """) or {}
     
-    def wait_for_loading_to_complete(self, timeout=120):
-        """Wait for loading indicators to disappear"""
-        logger.info("Waiting for loading to complete...")
-        start_time = time.time()
+    @staticmethod
+    def classify_search_response(state):
+        """Map the page state after a search to results, no_results, error_3046, wrong_captcha,
+        captcha_reset, server_error, site_error or pending"""
+        if state.get("indexii") or (state.get("grid_rows") or 0) > 1:
+            return "results"
+        if state.get("server_error"):
+            return "server_error"
         
-        while time.time() - start_time < timeout:
-            if self.is_loading_complete():
-                return True
-            time.sleep(2)
+        errors = " ".join(state.get("errors") or [])
+        if errors:
+            if "1259" in errors or re.search(r"captcha|कॅप्चा|invalid code", errors, re.IGNORECASE):
+                return "wrong_captcha"
+            if "3046" in errors:
+                return "error_3046"
+            if re.search(r"no record|not found|no data|उपलब्ध नाही|आढळ", errors, re.IGNORECASE):
+                return "no_results"
+            return "site_error"
         
-        logger.warning("Loading did not complete within timeout")
-        return False
+        if state.get("loading"):
+            return "pending"
+        if state.get("grid_rows") is not None:
+            return "no_results"
+        # The page came back asking for a captcha again
+        if state.get("captcha_empty"):
+            return "captcha_reset"
+        return "pending"
+    
+    def wait_for_search_response(self):
+        """Poll the page until the search response can be classified, or report a timeout.
+        A search slower than the learned p95 is also started on a second session and the first answer wins."""
+        search_started = time.time()
+        deadline = search_started + self.latency.timeout('search', 120)
+        hedge_after = self.latency.percentile('search', 0.95) if self.hedge_searches and self.last_search else None
+        if hedge_after is not None:
+            SearchHedger.shared().record_search()
+        
+        hedge = None
+        hedge_claimed = False
+        own_answer = None  # A failure of our own attempt, kept while the hedge may still succeed
+        state = {}
+        try:
+            while time.time() < deadline:
+                self.check_search_cancelled()
+                
+                if own_answer is None:
+                    try:
+                        state = self.read_search_state()
+                    except Exception as e:
+                        # The page may be replaced while the response arrives
+                        logger.debug(f"Could not read search state: {e}")
+                        state = {}
+                    
+                    outcome = self.classify_search_response(state)
+                    if outcome in ("results", "no_results", "error_3046") or (outcome != "pending" and not hedge):
+                        if hedge:
+                            HEDGED_SEARCHES.labels(result='lost').inc()
+                        return outcome, state
+                    if outcome != "pending":
+                        own_answer = (outcome, state)
+                
+                if hedge and hedge.future.done():
+                    hedge_claimed = True
+                    answer = self.take_hedge_answer(hedge)
+                    if answer:
+                        return answer
+                    hedge = None
+                    hedge_after = None
+                    if own_answer:
+                        return own_answer
+                
+                if not hedge and hedge_after is not None and time.time() - search_started > hedge_after:
+                    hedge = SearchHedger.shared().launch(self)
+                    hedge_after = None
+                
+                self.sleep(1)
+        finally:
+            if hedge and not hedge_claimed:
+                hedge.cancel()
+        
+        return own_answer or ("timeout", state)
+    
+    def take_hedge_answer(self, hedge):
+        """Use a finished hedge's answer if it has one, and return its session to the pool"""
+        try:
+            error = hedge.future.exception()
+            if error is None:
+                # The hedge session has the results on screen: continue the job in its browser
+                logger.info("Hedged search answered first, switching to its session")
+                HEDGED_SEARCHES.labels(result='won').inc()
+                self.adopt_session(hedge.session)
+                return "results", self.read_search_state()
+            if isinstance(error, NoSearchResultsError):
+                HEDGED_SEARCHES.labels(result='won').inc()
+                return error.outcome, {}
+            logger.warning(f"Hedged search failed: {error}")
+            HEDGED_SEARCHES.labels(result='failed').inc()
+            return None
+        finally:
+            hedge.release()
+    
+    def adopt_session(self, other):
+        """Swap browsers (and the search state that lives in them) with another downloader"""
+        for name in ("browser", "cdp_events", "supervisor", "profile_slot", "search_location", "results_page", "total_pages"):
+            mine, theirs = getattr(self, name), getattr(other, name)
+            setattr(self, name, theirs)
+            setattr(other, name, mine)
+        
+        # Commands are accounted to whichever downloader now drives each browser
+        for downloader in (self, other):
+            if downloader.browser:
+                downloader.instrument_browser()
+    
+    def create_hedge_session(self):
+        """A second downloader like this one, used only to run copies of stalled searches"""
+        session = Index2Downloader(
+            headless=self.headless,
+            downloads_path=self.downloads_path,
+            network_policy=self.network_policy,
+            persistent_profile=self.persistent_profile,
+            disk_cache_mb=self.disk_cache_mb,
+            hedge_searches=False
+        )
+        # Hedges add a browser for a job that already holds capacity
+        session.scheduler = None
+        return session
     
     def handle_error_1259(self):
-        """Handle specific error code 1259"""
+        """Refresh and solve the captcha after error 1259; the caller submits the search again"""
         logger.info("Handling error 1259...")
         
         try:
@@ -716,7 +3146,7 @@ class Index2Downloader:
             logger.info("Refreshing captcha...")
             refresh_button = self.browser.find_element(By.ID, "btnRefreshCaptcha")
             refresh_button.click()
-            time.sleep(2)  # Wait for new captcha to load
+            self.sleep(2)  # Wait for new captcha to load
             
             # Solve the new captcha
             captcha_text = self.solve_captcha()
@@ -726,21 +3156,6 @@ class Index2Downloader:
             captcha_input.clear()
             captcha_input.send_keys(captcha_text)
             
-            # Click search again
-            search_button = self.browser.find_element(By.ID, "btnSearch_RestMaha")
-            search_button.click()
-            
-            # Wait for loading to complete
-            self.wait_for_loading_to_complete()
-            
-            # Wait for results
-            WebDriverWait(self.browser, 120).until(
-                lambda d: (
-                    d.find_elements(By.ID, "RegistrationGrid") or 
-                    d.find_elements(By.CSS_SELECTOR, "span[style*='color:Red']")
-                )
-            )
-            
             return True
             
         except Exception as e:
@@ -751,6 +3166,9 @@ class Index2Downloader:
         """Click the Index-2 link in search results"""
         logger.info("Clicking Index-2 link...")
         
+        # The report may open in this tab and must render with all its resources
+        self.apply_network_policy(block=False)
+        
         try:
             # Find Index-2 buttons using multiple approaches
             index2_buttons = []
@@ -813,6 +3231,8 @@ class Index2Downloader:
             
             logger.info(f"Found total of {len(index2_buttons)} Index-2 buttons")
             
+            since = self.cdp_events.mark() if self.cdp_events else None
+            
             # Click the first button
             try:
                 # First try a normal click
@@ -832,34 +3252,41 @@ class Index2Downloader:
             # Wait for document page to load
             logger.info("Waiting for document page to load...")
             
-            # Wait for URL to change to the isaritaHTMLReportSuchiKramank2 page
-            try:
-                WebDriverWait(self.browser, 60).until(
-                    lambda d: "isaritaHTMLReportSuchiKramank2" in d.current_url
-                )
-                logger.info("Successfully navigated to IndexII page")
-            except:
-                logger.warning("URL didn't change to isaritaHTMLReportSuchiKramank2")
+            if self.cdp_events:
+                # The report opens either in this tab or in a new one
+                if self.wait_for_report_target(since, self.latency.timeout('report_load', 60)):
+                    logger.info("Successfully navigated to IndexII page")
+                else:
+                    logger.warning("No IndexII page opened")
+            else:
+                # Wait for URL to change to the isaritaHTMLReportSuchiKramank2 page
+                try:
+                    WebDriverWait(self.browser, self.latency.timeout('report_load', 60)).until(
+                        lambda d: "isaritaHTMLReportSuchiKramank2" in d.current_url
+                    )
+                    logger.info("Successfully navigated to IndexII page")
+                except:
+                    logger.warning("URL didn't change to isaritaHTMLReportSuchiKramank2")
                 
-                # Check if a new window or tab was opened
-                if len(self.browser.window_handles) > 1:
-                    logger.info(f"Found {len(self.browser.window_handles)} window handles, switching to the newest one")
+                    # Check if a new window or tab was opened
+                    if len(self.browser.window_handles) > 1:
+                        logger.info(f"Found {len(self.browser.window_handles)} window handles, switching to the newest one")
                     
-                    # Store the original window handle
-                    original_window = self.browser.current_window_handle
+                        # Store the original window handle
+                        original_window = self.browser.current_window_handle
                     
-                    # Switch to the new window
-                    for handle in self.browser.window_handles:
-                        if handle != original_window:
-                            self.browser.switch_to.window(handle)
-                            logger.info(f"Switched to window with URL: {self.browser.current_url}")
+                        # Switch to the new window
+                        for handle in self.browser.window_handles:
+                            if handle != original_window:
+                                self.browser.switch_to.window(handle)
+                                logger.info(f"Switched to window with URL: {self.browser.current_url}")
                             
-                            if "isaritaHTMLReportSuchiKramank2" in self.browser.current_url:
-                                logger.info("Found isaritaHTMLReportSuchiKramank2 page in new window")
-                                break
-                            else:
-                                # Switch back if not the right page
-                                self.browser.switch_to.window(original_window)
+                                if "isaritaHTMLReportSuchiKramank2" in self.browser.current_url:
+                                    logger.info("Found isaritaHTMLReportSuchiKramank2 page in new window")
+                                    break
+                                else:
+                                    # Switch back if not the right page
+                                    self.browser.switch_to.window(original_window)
             
             # Take a screenshot of the IndexII page
             self.browser.save_screenshot(os.path.join(self.downloads_path, "indexii_page.png"))
@@ -879,14 +3306,52 @@ class Index2Downloader:
             self.browser.save_screenshot(os.path.join(self.downloads_path, "click_index2_error.png"))
             raise
 
+    def wait_for_report_target(self, since, timeout=60):
+        """Wait for the IndexII report to open, switch to it and return its target id"""
+        current_target = self.browser.current_window_handle
+        
+        def is_report_target(event):
+            if event.get("method") == "Target.targetCreated":
+                return event["params"]["targetInfo"]["type"] == "page"
+            if event.get("method") == "Target.targetInfoChanged":
+                target_info = event["params"]["targetInfo"]
+                return target_info["targetId"] == current_target and "isaritaHTMLReportSuchiKramank2" in target_info["url"]
+            return False
+        
+        event = self.cdp_events.wait_for_event(is_report_target, since, timeout)
+        if not event:
+            return None
+        
+        target_id = event["params"]["targetInfo"]["targetId"]
+        if target_id != current_target:
+            self.cdp_events.watch_page_load(target_id)
+            self.cdp_events.wait_for_load([target_id], timeout)
+            self.browser.switch_to.window(target_id)
+            logger.info(f"Switched to report window with URL: {self.browser.current_url}")
+        return target_id
+
     def initialize_drive(self):
         """Initialize Google Drive API with service account"""
         SCOPES = ['https://www.googleapis.com/auth/drive']
         creds = service_account.Credentials.from_service_account_file(
             'service_account.json', scopes=SCOPES
         )
-        return build('drive', 'v3', credentials=creds)
+        # Use the discovery document bundled with google-api-python-client so
+        # building the client never has to fetch it over the network
+        return build('drive', 'v3', credentials=creds, static_discovery=True, cache_discovery=False)
 
+    @property
+    def drive_service(self):
+        """Google Drive client, created on first use and shared process-wide"""
+        global _drive_service
+        if _drive_service is None:
+            with _drive_service_lock:
+                if _drive_service is None:
+                    logger.info("Initializing Google Drive client...")
+                    _drive_service = self.initialize_drive()
+        return _drive_service
+
+    @timed_stage('upload_to_drive')
     def upload_to_drive(self, file_path, property_info):
         """Upload file to Google Drive with proper folder structure"""
         logger.info("Uploading file to Google Drive with folder structure...")
@@ -918,60 +3383,87 @@ class Index2Downloader:
                     ).execute()
                     return folder.get('id')
             
-            # Create folder hierarchy
-            year_folder_id = create_or_get_folder(self.drive_folder_id, year)
-            district_folder_id = create_or_get_folder(year_folder_id, district)
-            taluka_folder_id = create_or_get_folder(district_folder_id, taluka)
-            village_folder_id = create_or_get_folder(taluka_folder_id, village)
-            property_folder_id = create_or_get_folder(village_folder_id, property_number)
-            
-            # Upload file to property folder
-            file_metadata = {
-                'name': os.path.basename(file_path),
-                'parents': [property_folder_id]
-            }
+            with _drive_service_lock:
+                # Create folder hierarchy
+                year_folder_id = create_or_get_folder(self.drive_folder_id, year)
+                district_folder_id = create_or_get_folder(year_folder_id, district)
+                taluka_folder_id = create_or_get_folder(district_folder_id, taluka)
+                village_folder_id = create_or_get_folder(taluka_folder_id, village)
+                property_folder_id = create_or_get_folder(village_folder_id, property_number)
             
-            media = MediaFileUpload(file_path, mimetype='application/pdf')
-            file = self.drive_service.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields='id'
-            ).execute()
+                # Upload file to property folder
+                file_metadata = {
+                    'name': os.path.basename(file_path),
+                    'parents': [property_folder_id]
+                }
+            
+                media = MediaFileUpload(file_path, mimetype='application/pdf')
+                file = self.drive_service.files().create(
+                    body=file_metadata,
+                    media_body=media,
+                    fields='id'
+                ).execute()
             
-            logger.info(f"File uploaded successfully to folder structure: {year}/{district}/{taluka}/{village}/{property_number}")
-            return file.get('id')
+                logger.info(f"File uploaded successfully to folder structure: {year}/{district}/{taluka}/{village}/{property_number}")
+                UPLOAD_BYTES.inc(os.path.getsize(file_path))
+                return file.get('id')
             
         except Exception as e:
             logger.error(f"Error uploading file to Google Drive: {e}")
             raise
 
+    def document_file_path(self, property_info):
+        """Local path and file name of a document's PDF, creating its folder"""
+        # Ensure year is properly formatted
+        if 'year' in property_info and isinstance(property_info['year'], str):
+            # Try to extract year from date string (e.g., "DD/MM/YYYY")
+            if '/' in property_info['year']:
+                property_info['year'] = property_info['year'].split('/')[-1]
+            # Remove any non-numeric characters
+            property_info['year'] = ''.join(filter(str.isdigit, property_info['year']))
+        
+        # Create directory structure for local storage
+        dir_path = os.path.join(
+            self.downloads_path,
+            str(property_info.get('year', 'Unknown_Year')),
+            property_info.get('district_name', 'Unknown_District'),
+            property_info.get('taluka_name', 'Unknown_Taluka'),
+            property_info.get('village_name', 'Unknown_Village'),
+            str(property_info.get('property_number', 'Unknown_Property'))
+        )
+        os.makedirs(dir_path, exist_ok=True)
+        
+        # Generate filename
+        filename = f"Index-2_{property_info.get('district_name')}_{property_info.get('village_name')}_{property_info.get('property_number')}_{property_info.get('year')}.pdf"
+        return os.path.join(dir_path, filename), filename
+
+    def publish_document(self, file_path, filename, property_info):
+        """Compact and upload a rendered PDF and build its download result"""
+        bytes_saved = self.compact_output(file_path)
+        
+        # Upload to Google Drive
+        file_id = self.upload_to_drive(file_path, property_info)
+        drive_link = f"https://drive.google.com/file/d/{file_id}/view"
+        self.reports_db.set_drive_link(file_path, drive_link)
+        
+        return {
+            "success": True,
+            "file_id": file_id,
+            "file_name": filename,
+            "file_path": file_path,
+            "doc_number": property_info.get("doc_number"),
+            "bytes_saved": bytes_saved,
+            "drive_link": drive_link
+        }
+
+    @timed_stage('download_indexii_document')
     def download_indexii_document(self, url, property_info):
         """Download the IndexII document and upload to Google Drive"""
         logger.info("Downloading IndexII document...")
         
         try:
-            # Ensure year is properly formatted
-            if 'year' in property_info and isinstance(property_info['year'], str):
-                # Try to extract year from date string (e.g., "DD/MM/YYYY")
-                if '/' in property_info['year']:
-                    property_info['year'] = property_info['year'].split('/')[-1]
-                # Remove any non-numeric characters
-                property_info['year'] = ''.join(filter(str.isdigit, property_info['year']))
-            
-            # Create directory structure for local storage
-            dir_path = os.path.join(
-                self.downloads_path,
-                str(property_info.get('year', 'Unknown_Year')),
-                property_info.get('district_name', 'Unknown_District'),
-                property_info.get('taluka_name', 'Unknown_Taluka'),
-                property_info.get('village_name', 'Unknown_Village'),
-                str(property_info.get('property_number', 'Unknown_Property'))
-            )
-            os.makedirs(dir_path, exist_ok=True)
-            
-            # Generate filename
-            filename = f"Index-2_{property_info.get('district_name')}_{property_info.get('village_name')}_{property_info.get('property_number')}_{property_info.get('year')}.pdf"
-            file_path = os.path.join(dir_path, filename)
+            file_path, filename = self.document_file_path(property_info)
+            dir_path = os.path.dirname(file_path)
             
             # Navigate to the URL if not already there
             if self.browser.current_url != url and url != "":
@@ -979,10 +3471,17 @@ class Index2Downloader:
                 self.browser.get(url)
                 
                 # Wait for the page to load
-                WebDriverWait(self.browser, 60).until(
+                WebDriverWait(self.browser, self.latency.timeout('report_load', 60)).until(
                     lambda d: d.execute_script("return document.readyState") == "complete"
                 )
             
+            # Keep the report's fields queryable without reopening the PDF
+            self.extract_report_fields(property_info, file_path)
+            
+            # Hand the page to the offline renderers instead of printing it here
+            if self.render_mode == "snapshot":
+                return self.capture_snapshot(file_path, filename, property_info)
+            
             # Take a screenshot of the page first
             self.browser.save_screenshot(os.path.join(self.downloads_path, "before_pdf_generation.png"))
             
@@ -991,22 +3490,9 @@ class Index2Downloader:
             
             try:
                 # Try the first method: Chrome DevTools Protocol
-                print_params = {
-                    "landscape": False,
-                    "printBackground": True,
-                    "paperWidth": 8.27,  # A4 width in inches
-                    "paperHeight": 11.69,  # A4 height in inches
-                    "marginTop": 0.4,
-                    "marginBottom": 0.4,
-                    "marginLeft": 0.4,
-                    "marginRight": 0.4,
-                    "scale": 0.9,
-                    "pageRanges": "",
-                    "preferCSSPageSize": True
-                }
-                
                 # Execute Chrome DevTools Protocol command to print to PDF
-                pdf_data = self.browser.execute_cdp_cmd("Page.printToPDF", print_params)
+                with STAGE_DURATION.labels(stage='render_pdf').time():
+                    pdf_data = self.browser.execute_cdp_cmd("Page.printToPDF", PDF_PRINT_PARAMS)
                 
                 if pdf_data and 'data' in pdf_data:
                     # Save the PDF
@@ -1014,6 +3500,7 @@ class Index2Downloader:
                         f.write(base64.b64decode(pdf_data['data']))
                     
                     logger.info(f"Successfully saved PDF: {file_path}")
+                    DOCUMENTS_DOWNLOADED.inc()
                 else:
                     raise Exception("Failed to generate PDF data")
                     
@@ -1050,7 +3537,7 @@ class Index2Downloader:
                     if print_buttons:
                         logger.info(f"Found {len(print_buttons)} print buttons, clicking the first one")
                         print_buttons[0].click()
-                        time.sleep(5)  # Wait for print dialog
+                        self.sleep(5)  # Wait for print dialog
                     else:
                         logger.info("No print buttons found, using window.print()")
                         
@@ -1063,7 +3550,7 @@ class Index2Downloader:
                         
                         # Try to use window.print()
                         self.browser.execute_script("window.print();")
-                        time.sleep(5)  # Wait for print dialog
+                        self.sleep(5)  # Wait for print dialog
                         
                         # Since we can't directly interact with the print dialog, inform the user
                         logger.warning("Print dialog opened. Please manually save as PDF and press ENTER to continue...")
@@ -1094,15 +3581,7 @@ class Index2Downloader:
             
             # Check if file exists and has reasonable size
             if os.path.exists(file_path) and os.path.getsize(file_path) > 1000:
-                # Upload to Google Drive
-                file_id = self.upload_to_drive(file_path, property_info)
-                
-                return {
-                    "success": True,
-                    "file_id": file_id,
-                    "file_name": filename,
-                    "drive_link": f"https://drive.google.com/file/d/{file_id}/view"
-                }
+                return self.publish_document(file_path, filename, property_info)
             else:
                 logger.warning(f"PDF file seems too small or missing: {file_path}")
                 
@@ -1134,496 +3613,785 @@ class Index2Downloader:
                 }
         
         except Exception as e:
-            logger.error(f"Error downloading IndexII document: {e}")
-            self.browser.save_screenshot(os.path.join(self.downloads_path, "download_indexii_error.png"))
-            raise
+            logger.error(f"Error downloading IndexII document: {e}")
+            self.browser.save_screenshot(os.path.join(self.downloads_path, "download_indexii_error.png"))
+            raise
+
+    def read_results_grid(self):
+        """Read every row of the current RegistrationGrid page with a single script call"""
+        grid_data = self.browser.execute_script("""
+            var grid = document.getElementById('RegistrationGrid');
+            if (!grid) {
+                return null;
+            }
+            var records = [];
+            var pageNumbers = [];
+            var ellipsisPages = [];
+            var currentPage = null;
+            var buttonIndex = 0;
+            for (var i = 1; i < grid.rows.length; i++) {
+                var row = grid.rows[i];
+                var links = row.querySelectorAll("a[href*='Page$']");
+                if (links.length) {
+                    // Pagination row: collect every page number it links to
+                    for (var j = 0; j < links.length; j++) {
+                        var match = links[j].getAttribute('href').match(/Page\\$(\\d+)/);
+                        if (match) {
+                            var linkedPage = parseInt(match[1], 10);
+                            if ((links[j].innerText || '').trim() === '...') {
+                                ellipsisPages.push(linkedPage);
+                            } else {
+                                pageNumbers.push(linkedPage);
+                            }
+                        }
+                    }
+                    // The current page is rendered as plain text instead of a link
+                    var spans = row.querySelectorAll('span');
+                    for (var k = 0; k < spans.length; k++) {
+                        var spanPage = parseInt(spans[k].innerText, 10);
+                        if (!isNaN(spanPage)) {
+                            currentPage = spanPage;
+                        }
+                    }
+                    continue;
+                }
+                var cells = row.cells;
+                var button = row.querySelector("input[value='IndexII']");
+                var text = function(k) {
+                    return cells.length > k ? (cells[k].innerText || '').trim() : null;
+                };
+                records.push({
+                    row_index: records.length,
+                    button_index: button ? buttonIndex++ : null,
+                    doc_number: text(0),
+                    doc_type: text(1),
+                    reg_date: text(2),
+                    sro_name: text(3),
+                    button_name: button ? button.getAttribute('name') : null,
+                    button_id: button ? button.id : null,
+                    onclick: button ? button.getAttribute('onclick') : null
+                });
+            }
+            return {
+                records: records,
+                page_numbers: pageNumbers.concat(ellipsisPages),
+                ellipsis_pages: ellipsisPages,
+                current_page: currentPage
+            };
+        """)
+        
+        if not grid_data:
+            raise Exception("No search results table found")
+        
+        # Without a pager there is a single page of results
+        current_page = grid_data["current_page"] or 1
+        grid_data["current_page"] = current_page
+        self.results_page = current_page
+        
+        # The page count is only known once no '...' link points past the visible range
+        if any(page > current_page for page in grid_data["ellipsis_pages"]):
+            self.total_pages = None
+        else:
+            self.total_pages = max(grid_data["page_numbers"] + [current_page])
+        
+        # Resolve report URLs opened directly from the button's onclick handler
+        for i, record in enumerate(grid_data["records"]):
+            record["doc_number"] = record["doc_number"] or f"Unknown_{i+1}"
+            record["doc_type"] = record["doc_type"] or "Unknown"
+            record["reg_date"] = record["reg_date"] or "Unknown"
+            record["sro_name"] = record["sro_name"] or "Unknown"
+            record["report_url"] = None
+            match = re.search(r"window\.open\(\s*['\"]([^'\"]+)['\"]", record.pop("onclick") or "")
+            if match:
+                record["report_url"] = urljoin(self.browser.current_url, match.group(1))
+        
+        return grid_data
+
+    @timed_stage('go_to_results_page')
+    def go_to_results_page(self, page_number):
+        """Jump straight to any results page with the grid's own postback and return its grid data"""
+        if page_number < 1 or (self.total_pages and page_number > self.total_pages):
+            raise Exception(f"Page {page_number} is out of range (total pages: {self.total_pages})")
+        
+        grid = self.browser.find_element(By.ID, "RegistrationGrid")
+        
+        # Same postback the pager links issue, without needing the link to be visible
+        self.browser.execute_script("__doPostBack('RegistrationGrid', arguments[0]);", f"Page${page_number}")
+        
+        # The grid is replaced by the postback
+        postback_started = time.time()
+        postback_timeout = self.latency.timeout('postback', 30)
+        try:
+            WebDriverWait(self.browser, postback_timeout).until(EC.staleness_of(grid))
+            WebDriverWait(self.browser, postback_timeout).until(
+                EC.presence_of_element_located((By.ID, "RegistrationGrid"))
+            )
+        finally:
+            self.latency.observe('postback', time.time() - postback_started)
+        
+        grid_data = self.read_results_grid()
+        if grid_data["current_page"] != page_number:
+            raise Exception(f"Expected results page {page_number} but the grid shows page {grid_data['current_page']}")
+        
+        logger.info(f"Navigated to results page {page_number}")
+        return grid_data
+
+    @timed_stage('harvest_search_results')
+    def harvest_search_results(self, start_page=1, end_page=None):
+        """Collect all rows from start_page to end_page (or the last page) without opening any report"""
+        logger.info("Harvesting search results...")
+        
+        if not self.browser.find_elements(By.ID, "RegistrationGrid"):
+            logger.error("No search results table found")
+            self.browser.save_screenshot(os.path.join(self.downloads_path, "no_results_table.png"))
+            raise Exception("No search results table found")
+        
+        # The selected location does not change between pages, read it once
+        self.search_location = {
+            "district_name": self.get_district_name(None),
+            "taluka_name": self.get_taluka_name(None),
+            "village_name": self.get_village_name(None)
+        }
+        
+        all_records = []
+        grid_data = self.read_results_grid()
+        
+        # Resuming or splitting work starts with a direct jump
+        if start_page != self.results_page:
+            grid_data = self.go_to_results_page(start_page)
+        current_page = start_page
+        
+        while True:
+            for record in grid_data["records"]:
+                record["page"] = current_page
+                all_records.append(record)
+            logger.info(f"Harvested {len(grid_data['records'])} records on page {current_page}")
+            
+            if end_page and current_page >= end_page:
+                break
+            
+            # The '...' link also points at a concrete page number beyond the visible range
+            if current_page + 1 not in grid_data["page_numbers"]:
+                logger.info(f"No more pages after page {current_page}")
+                break
+            
+            try:
+                grid_data = self.go_to_results_page(current_page + 1)
+                current_page += 1
+            except Exception as navigation_error:
+                logger.error(f"Error navigating to page {current_page + 1}: {navigation_error}")
+                self.browser.save_screenshot(os.path.join(self.downloads_path, f"navigation_error_page{current_page}.png"))
+                break
+        
+        logger.info(f"Harvested {len(all_records)} records from pages {start_page}-{current_page} (total pages: {self.total_pages or 'unknown'})")
+        return all_records
+
+    def get_record_property_info(self, record):
+        """Build the property info used for storage paths from a harvested record"""
+        location = self.search_location or {}
+        reg_date = record.get("reg_date", "Unknown")
+        
+        return {
+            "doc_number": record.get("doc_number"),
+            "doc_type": record.get("doc_type"),
+            "reg_date": reg_date,
+            "sro_name": record.get("sro_name"),
+            "district_name": location.get("district_name"),
+            "taluka_name": location.get("taluka_name"),
+            "village_name": location.get("village_name"),
+            "property_number": f"{self.current_property_number}_{record.get('doc_number')}",
+            "year": reg_date.split('/')[-1] if '/' in reg_date else "Unknown",
+            "page": record.get("page")
+        }
+
+    def find_record_button(self, record):
+        """Find the IndexII button of a harvested record on the current page"""
+        if record.get("button_name"):
+            buttons = self.browser.find_elements(By.NAME, record["button_name"])
+            if buttons:
+                return buttons[0]
+        
+        if record.get("button_id"):
+            buttons = self.browser.find_elements(By.ID, record["button_id"])
+            if buttons:
+                return buttons[0]
+        
+        # Fall back to the button position within the grid
+        if record.get("button_index") is not None:
+            grid = self.browser.find_element(By.ID, "RegistrationGrid")
+            buttons = grid.find_elements(By.CSS_SELECTOR, "input[value='IndexII']")
+            if len(buttons) > record["button_index"]:
+                return buttons[record["button_index"]]
+        
+        return None
+
+    @timed_stage('open_report_tab')
+    def open_report_tab(self, record):
+        """Click the IndexII button of a harvested record and return the handle of the new tab"""
+        handles_before = set(self.browser.window_handles)
+        since = self.cdp_events.mark() if self.cdp_events else None
+        
+        # Opening a report may post back the results page, so make sure the grid is there
+        WebDriverWait(self.browser, self.latency.timeout('postback', 30)).until(
+            EC.presence_of_element_located((By.ID, "RegistrationGrid"))
+        )
+        
+        button = self.find_record_button(record)
+        if button:
+            self.browser.execute_script("arguments[0].click();", button)
+            logger.info(f"Clicked IndexII button for document {record['doc_number']}")
+        elif record.get("report_url"):
+            self.browser.execute_script("window.open(arguments[0], '_blank');", record["report_url"])
+            logger.info(f"Opened report URL for document {record['doc_number']}")
+        else:
+            raise Exception(f"No IndexII button or report URL for document {record['doc_number']}")
+        
+        new_handle = self.wait_for_new_window(handles_before, since)
+        if not new_handle:
+            logger.warning(f"No report window opened for document {record['doc_number']}")
+        return new_handle
+
+    def wait_for_new_window(self, handles_before, since=None, timeout=None):
+        """Wait for a tab opened after a click and return its handle, or None"""
+        timeout = timeout or self.latency.timeout('report_open', 30)
+        wait_start = time.time()
+        if self.cdp_events:
+            # Chromedriver window handles are DevTools target ids
+            target_id = self.cdp_events.wait_for_new_page(since, timeout)
+            if target_id:
+                self.cdp_events.watch_page_load(target_id)
+            self.latency.observe('report_open', time.time() - wait_start if target_id else timeout)
+            return target_id
+        
+        while time.time() - wait_start < timeout:
+            new_handles = set(self.browser.window_handles) - handles_before
+            if new_handles:
+                self.latency.observe('report_open', time.time() - wait_start)
+                return list(new_handles)[0]
+            self.sleep(0.5)
+        self.latency.observe('report_open', timeout)
+        return None
+
+    def wait_for_loaded_tab(self, open_tabs):
+        """Switch to the first open report tab that has finished loading and return its handle"""
+        timeout = self.latency.timeout('report_load', 60)
+        
+        if self.cdp_events:
+            oldest = min(tab["opened_at"] for tab in open_tabs.values())
+            handle = self.cdp_events.wait_for_load(list(open_tabs), max(0, oldest + timeout - time.time()))
+            if not handle:
+                logger.warning("Timeout waiting for page to load completely")
+                handle = min(open_tabs, key=lambda h: open_tabs[h]["opened_at"])
+            loaded_at = self.cdp_events.loaded_at(handle) or time.time()
+            self.latency.observe('report_load', loaded_at - open_tabs[handle]["opened_at"])
+            self.browser.switch_to.window(handle)
+            return handle
+        
+        while True:
+            for handle, tab in open_tabs.items():
+                self.browser.switch_to.window(handle)
+                if self.browser.execute_script("return document.readyState") == "complete":
+                    self.latency.observe('report_load', time.time() - tab["opened_at"])
+                    return handle
+                if time.time() - tab["opened_at"] > timeout:
+                    logger.warning("Timeout waiting for page to load completely")
+                    self.latency.observe('report_load', timeout)
+                    return handle
+            self.sleep(0.5)
+
+    def match_tab_record(self, open_tabs, handle):
+        """Make sure a loaded report tab is paired with the record whose document it shows"""
+        record = open_tabs[handle]["record"]
+        
+        try:
+            page_text = self.browser.execute_script("return document.body ? document.body.innerText : '';") or ""
+        except Exception as text_error:
+            logger.warning(f"Could not read report text: {text_error}")
+            return record
+        
+        if shows_document_number(page_text, record["doc_number"]):
+            return record
+        
+        # Tabs can open out of order, so look for the document among the other open tabs
+        for other_handle, other_tab in open_tabs.items():
+            other_record = other_tab["record"]
+            if other_handle != handle and shows_document_number(page_text, other_record["doc_number"]):
+                logger.info(f"Report tab shows document {other_record['doc_number']}, not {record['doc_number']}")
+                other_tab["record"] = record
+                open_tabs[handle]["record"] = other_record
+                return other_record
+        
+        logger.warning(f"Could not confirm document {record['doc_number']} in its report tab")
+        return record
+
+    def download_page_records(self, records, original_window, page=1):
+        """Render the reports of one results page through a bounded pool of tabs"""
+        results = []
+        pending = list(records)
+        open_tabs = {}
+        draining = False
+        
+        while pending or open_tabs:
+            if self.job_timed_out:
+                raise JobTimeoutError(f"Job exceeded its {self.job_timeout}s limit")
+            
+            # Stop opening reports when the browser needs a restart or higher-priority work is queued,
+            # and act once the open ones are done
+            if pending and not draining:
+                draining = bool(self.supervisor.recycle_reason(self.browser)) or (
+                    self.holding_slot and self.scheduler.should_yield(self.job_priority))
+            if draining and not open_tabs:
+                original_window = self.recycle_browser_if_needed(page, original_window)
+                original_window = self.yield_if_preempted(page, original_window)
+                draining = False
+            
+            # Keep up to max_tabs reports loading at the same time
+            while pending and not draining and len(open_tabs) < self.max_tabs:
+                record = pending.pop(0)
+                try:
+                    self.browser.switch_to.window(original_window)
+                    handle = self.open_report_tab(record)
+                    if handle:
+                        open_tabs[handle] = {"record": record, "opened_at": time.time()}
+                except Exception as open_error:
+                    logger.error(f"Error opening report for document {record['doc_number']}: {open_error}")
+            
+            if not open_tabs:
+                continue
+            
+            # Render whichever tab is ready first
+            handle = self.wait_for_loaded_tab(open_tabs)
+            record = self.match_tab_record(open_tabs, handle)
+            del open_tabs[handle]
+            
+            try:
+                logger.info(f"Rendering document {record['doc_number']} from {self.browser.current_url}")
+                result = self.download_indexii_document(self.browser.current_url, self.get_record_property_info(record))
+                results.append(result)
+                if self.search_key and result.get("success") and not result.get("pending_render"):
+                    self.search_cache.put_document(self.search_key, record["doc_number"], result)
+                logger.info(f"Successfully downloaded document {record['doc_number']} from page {record['page']}")
+            except Exception as download_error:
+                logger.error(f"Error downloading document {record['doc_number']} from page {record['page']}: {download_error}")
+            finally:
+                self.supervisor.document_done()
+                self.browser.close()
+                self.browser.switch_to.window(original_window)
+                if self.cdp_events:
+                    self.cdp_events.forget_target(handle)
+        
+        return results
+
+    def recycle_browser_if_needed(self, page, original_window):
+        """Restart the browser when the supervisor says so and bring back the same results page"""
+        reason = self.supervisor.recycle_reason(self.browser)
+        if not reason or not self.last_search:
+            return original_window
+        
+        logger.warning(f"Recycling browser: {reason}")
+        BROWSER_RECYCLES.labels(reason=reason.split(" ")[0]).inc()
+        return self.restore_results_page(page)
+
+    def restore_results_page(self, page):
+        """Start a fresh browser, repeat the last search and return to a results page"""
+        self.quit_browser()
+        self.run_search(*self.last_search)
+        self.results_page = 1
+        if page != self.results_page:
+            self.go_to_results_page(page)
+        return self.browser.current_window_handle
+
+    @timed_stage('download_harvested_documents')
+    def download_harvested_documents(self, records):
+        """Download the IndexII report of every harvested record"""
+        logger.info(f"Downloading {len(records)} harvested documents using up to {self.max_tabs} tabs...")
+        
+        if self.backend == "cdp":
+            return CdpEventLoop.shared().run(self.download_harvested_documents_async(records))
+        
+        all_results = []
+        original_window = self.browser.current_window_handle
+        
+        records_by_page = {}
+        for record in records:
+            records_by_page.setdefault(record.get("page", 1), []).append(record)
+        
+        # Start with the page already on screen, then jump directly to the others
+        for page in sorted(records_by_page, key=lambda p: (p != self.results_page, p)):
+            try:
+                self.browser.switch_to.window(original_window)
+                if page != self.results_page:
+                    self.go_to_results_page(page)
+                all_results.extend(self.download_page_records(records_by_page[page], original_window, page))
+                original_window = self.browser.current_window_handle
+            except Exception as page_error:
+                logger.error(f"Error processing page {page}: {page_error}")
+                self.browser.save_screenshot(os.path.join(self.downloads_path, f"page_error_{page}.png"))
+        
+        self.finish_pending_renders()
+        logger.info(f"Downloaded {len(all_results)} of {len(records)} documents")
+        return all_results
+
+    @timed_stage('extract_report_fields')
+    def extract_report_fields(self, property_info, file_path, html=None, url=None):
+        """Parse the report (on screen unless its HTML is given) and store its fields in the local database"""
+        try:
+            report = parse_indexii_report(html if html is not None else self.browser.page_source)
+            self.reports_db.put(report, property_info, url=url or self.browser.current_url, file_path=file_path)
+            logger.info(f"Stored fields of document {report.get('doc_number') or property_info.get('doc_number')}")
+            return report
+        except Exception as e:
+            # The PDF is still produced when the report layout cannot be parsed
+            logger.warning(f"Could not extract report fields: {e}")
+            return None
+
+    async def download_harvested_documents_async(self, records):
+        """DevTools backend: open reports from the results tab and render them concurrently on one event loop"""
+        debugger_address = self.browser.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+        connection = await AsyncCdpConnection.open(debugger_address)
+        
+        try:
+            # Chromedriver window handles are DevTools target ids
+            results_tab = await connection.attach(self.browser.current_window_handle)
+            await connection.send("Target.setDiscoverTargets", {"discover": True})
+            
+            tab_slots = asyncio.Semaphore(self.max_tabs)
+            renders = []
+            loaded_events = []
+            
+            records_by_page = {}
+            for record in records:
+                records_by_page.setdefault(record.get("page", 1), []).append(record)
+            
+            for page in sorted(records_by_page, key=lambda p: (p != self.results_page, p)):
+                try:
+                    if page != self.results_page:
+                        # Reports opened from this page must be loaded before the session moves on
+                        await asyncio.gather(*(event.wait() for event in loaded_events))
+                        await results_tab.postback(
+                            f"__doPostBack('RegistrationGrid', {json.dumps(f'Page${page}')})",
+                            self.latency.timeout('postback', 30)
+                        )
+                        self.results_page = page
+                        logger.info(f"Navigated to results page {page}")
+                    
+                    for record in records_by_page[page]:
+                        if self.job_timed_out:
+                            raise JobTimeoutError(f"Job exceeded its {self.job_timeout}s limit")
+                        
+                        # Step aside for higher-priority jobs once the reports in flight are done
+                        if self.holding_slot and self.scheduler.should_yield(self.job_priority):
+                            await asyncio.gather(*renders)
+                            await asyncio.to_thread(self.pause_for_higher_priority)
+                        
+                        await tab_slots.acquire()
+                        try:
+                            target_id = await self.open_report_target_async(connection, results_tab, record)
+                        except Exception as open_error:
+                            tab_slots.release()
+                            logger.error(f"Error opening report for document {record['doc_number']}: {open_error}")
+                            continue
+                        
+                        loaded = asyncio.Event()
+                        loaded_events.append(loaded)
+                        renders.append(asyncio.create_task(
+                            self.render_report_async(connection, record, target_id, tab_slots, loaded)
+                        ))
+                except JobTimeoutError:
+                    raise
+                except Exception as page_error:
+                    logger.error(f"Error processing page {page}: {page_error}")
+            
+            results = [result for result in await asyncio.gather(*renders) if result]
+        finally:
+            await connection.close()
+        
+        logger.info(f"Downloaded {len(results)} of {len(records)} documents")
+        return results
+
+    async def open_report_target_async(self, connection, results_tab, record):
+        """Click the IndexII button of a record in the results tab and return the new report target"""
+        target_created = connection.expect(
+            "Target.targetCreated",
+            predicate=lambda params: params["targetInfo"].get("type") == "page"
+            and params["targetInfo"].get("openerId") == results_tab.target_id
+        )
+        
+        opened = await results_tab.evaluate(f"""
+            (record => {{
+                let button = null;
+                if (record.button_name) button = document.getElementsByName(record.button_name)[0] || null;
+                if (!button && record.button_id) button = document.getElementById(record.button_id);
+                if (!button && record.button_index !== null && record.button_index !== undefined) {{
+                    const grid = document.getElementById('RegistrationGrid');
+                    button = grid ? grid.querySelectorAll("input[value='IndexII']")[record.button_index] || null : null;
+                }}
+                if (button) {{ button.click(); return 'button'; }}
+                if (record.report_url) {{ window.open(record.report_url, '_blank'); return 'url'; }}
+                return null;
+            }})({json.dumps(record, ensure_ascii=False)})
+        """)
+        if not opened:
+            target_created.cancel()
+            raise Exception(f"No IndexII button or report URL for document {record['doc_number']}")
+        
+        opened_at = time.time()
+        timeout = self.latency.timeout('report_open', 30)
+        try:
+            params = await asyncio.wait_for(target_created, timeout)
+        except asyncio.TimeoutError:
+            self.latency.observe('report_open', timeout)
+            raise
+        self.latency.observe('report_open', time.time() - opened_at)
+        logger.info(f"Opened report for document {record['doc_number']} ({opened})")
+        
+        # The click may post back the results page before the report window opens
+        await self.wait_for_grid_async(results_tab)
+        return params["targetInfo"]["targetId"]
+
+    async def wait_for_grid_async(self, results_tab, timeout=None):
+        """Wait until the results tab shows a fully loaded grid"""
+        deadline = time.time() + (timeout or self.latency.timeout('postback', 30))
+        while time.time() < deadline:
+            try:
+                if await results_tab.evaluate("document.readyState === 'complete' && !!document.getElementById('RegistrationGrid')"):
+                    return
+            except Exception:
+                # The execution context is replaced while a postback is in flight
+                pass
+            await asyncio.sleep(0.2)
+        raise Exception("Results grid did not come back")
+
+    async def render_report_async(self, connection, record, target_id, tab_slots, loaded):
+        """Wait for a report tab to load, store its fields and print it to PDF"""
+        property_info = self.get_record_property_info(record)
+        report_tab = None
+        opened_at = time.time()
+        
+        try:
+            report_tab = await connection.attach(target_id)
+            load_event = report_tab.expect_load()
+            try:
+                await report_tab.wait_for_load(load_event, self.latency.timeout('report_load', 60))
+            except asyncio.TimeoutError:
+                logger.warning(f"Timeout waiting for the report of document {record['doc_number']} to load")
+            self.latency.observe('report_load', time.time() - opened_at)
+            loaded.set()
+            
+            html = await report_tab.html()
+            url = await report_tab.evaluate("location.href")
+            # Parsing and the SQLite writes would stall every tab on the shared loop
+            file_path, filename = await asyncio.to_thread(self.store_report_html, record, property_info, html, url)
+            
+            render_start = time.time()
+            pdf_data = await report_tab.print_to_pdf()
+            STAGE_DURATION.labels(stage='render_pdf').observe(time.time() - render_start)
+            with open(file_path, "wb") as f:
+                f.write(pdf_data)
+            logger.info(f"Successfully saved PDF: {file_path}")
+            DOCUMENTS_DOWNLOADED.inc()
+            
+            # Compaction and the Drive upload block, so they run off the event loop
+            result = await asyncio.to_thread(self.publish_document, file_path, filename, property_info)
+            if self.search_key:
+                await asyncio.to_thread(self.search_cache.put_document, self.search_key, record["doc_number"], result)
+            logger.info(f"Successfully downloaded document {record['doc_number']} from page {record['page']}")
+            return result
+        except Exception as e:
+            logger.error(f"Error downloading document {record['doc_number']} from page {record['page']}: {e}")
+            return None
+        finally:
+            loaded.set()
+            self.supervisor.document_done()
+            try:
+                await connection.send("Target.closeTarget", {"targetId": target_id})
+            except Exception:
+                pass
+            tab_slots.release()
+
+    def store_report_html(self, record, property_info, html, url):
+        """Check a rendered report belongs to its record and store its fields; returns the PDF path and name"""
+        if not shows_document_number(BeautifulSoup(html, "html.parser").get_text(" "), record["doc_number"]):
+            logger.warning(f"Could not confirm document {record['doc_number']} in its report tab")
+        
+        file_path, filename = self.document_file_path(property_info)
+        self.extract_report_fields(property_info, file_path, html=html, url=url)
+        return file_path, filename
+
+    @timed_stage('capture_snapshot')
+    def capture_snapshot(self, file_path, filename, property_info):
+        """Save the report as a self-contained MHTML snapshot and queue it for offline PDF rendering"""
+        snapshot = self.browser.execute_cdp_cmd("Page.captureSnapshot", {"format": "mhtml"})
+        snapshot_path = os.path.splitext(file_path)[0] + ".mhtml"
+        with open(snapshot_path, "w", encoding="utf-8", newline="") as f:
+            f.write(snapshot['data'])
+        logger.info(f"Saved report snapshot: {snapshot_path}")
+        
+        result = {
+            "success": True,
+            "file_path": file_path,
+            "file_name": filename,
+            "doc_number": property_info.get("doc_number"),
+            "snapshot_path": snapshot_path,
+            "pending_render": True
+        }
+        
+        def on_rendered(pdf_path):
+            DOCUMENTS_DOWNLOADED.inc()
+            result["bytes_saved"] = self.compact_output(pdf_path)
+            return self.upload_to_drive(pdf_path, property_info)
+        
+        future = SnapshotRenderPool.shared(self.render_workers).submit(snapshot_path, file_path, on_rendered)
+        self.pending_renders.append((future, result, property_info))
+        return result
+
+    def finish_pending_renders(self):
+        """Wait for queued snapshot renders and fill in their results"""
+        if not self.pending_renders:
+            return
+        
+        logger.info(f"Waiting for {len(self.pending_renders)} snapshot renders...")
+        for future, result, property_info in self.pending_renders:
+            try:
+                file_id = future.result()
+                result.update({
+                    "file_id": file_id,
+                    "drive_link": f"https://drive.google.com/file/d/{file_id}/view"
+                })
+                self.reports_db.set_drive_link(result["file_path"], result["drive_link"])
+                if self.search_key and property_info.get("doc_number"):
+                    self.search_cache.put_document(self.search_key, property_info["doc_number"], result)
+            except Exception as e:
+                result.update({"success": False, "error": f"Snapshot rendering failed: {e}"})
+            result.pop("pending_render", None)
+        self.pending_renders = []
+
+    def compact_output(self, file_path):
+        """Compact a freshly rendered PDF if enabled, returning the bytes saved"""
+        if not self.compact_pdfs:
+            return 0
+        
+        try:
+            saved = compact_pdf(file_path)
+            logger.info(f"Compacted {os.path.basename(file_path)}: saved {saved} bytes")
+            return saved
+        except Exception as e:
+            # An uncompacted PDF is still a valid document
+            logger.warning(f"Could not compact {file_path}: {e}")
+            return 0
+
+    @timed_stage('bundle_documents')
+    def bundle_property_documents(self, results):
+        """Merge the downloaded documents of the current property into one PDF bookmarked by document number"""
+        documents = [
+            (f"Document {result.get('doc_number') or result.get('file_name')}", result["file_path"])
+            for result in results
+            if result.get("success") and result.get("file_path", "").endswith(".pdf") and os.path.exists(result["file_path"])
+        ]
+        if not documents:
+            logger.info("No downloaded PDFs to bundle")
+            return None
+        
+        location = self.search_location or {}
+        property_info = {
+            "year": "Bundles",
+            "district_name": location.get("district_name", "Unknown_District"),
+            "taluka_name": location.get("taluka_name", "Unknown_Taluka"),
+            "village_name": location.get("village_name", "Unknown_Village"),
+            "property_number": str(self.current_property_number)
+        }
+        bundle_path = os.path.join(
+            self.downloads_path,
+            property_info["year"],
+            property_info["district_name"],
+            property_info["taluka_name"],
+            property_info["village_name"],
+            property_info["property_number"],
+            f"Index-2_{property_info['district_name']}_{property_info['village_name']}_{property_info['property_number']}_bundle.pdf"
+        )
+        
+        build_pdf_bundle(documents, bundle_path)
+        separate_size = sum(os.path.getsize(pdf_path) for _, pdf_path in documents)
+        bundle_size = os.path.getsize(bundle_path)
+        logger.info(f"Bundled {len(documents)} documents into {bundle_path} ({bundle_size} bytes, {separate_size} bytes as separate files)")
+        
+        file_id = self.upload_to_drive(bundle_path, property_info)
+        return {
+            "file_name": os.path.basename(bundle_path),
+            "file_path": bundle_path,
+            "documents": len(documents),
+            "bytes": bundle_size,
+            # Fonts are embedded per document, so a bundle can be larger than the separate files
+            "size_delta": bundle_size - separate_size,
+            "file_id": file_id,
+            "drive_link": f"https://drive.google.com/file/d/{file_id}/view"
+        }
+
+    def finish_download_results(self, results):
+        """Build the job result for downloaded documents, adding the bundle and compaction totals"""
+        job_result = {
+            "success": True,
+            "results": results,
+            "count": len(results),
+            "bytes_saved": sum(result.get("bytes_saved", 0) for result in results if not result.get("cached"))
+        }
+        
+        if self.bundle_documents:
+            try:
+                job_result["bundle"] = self.bundle_property_documents(results)
+            except Exception as e:
+                logger.error(f"Error bundling documents: {e}")
+                job_result["bundle_error"] = str(e)
+        
+        rendered = len([result for result in results if not result.get("cached")])
+        logger.info(f"Compaction saved {job_result['bytes_saved']} bytes across {rendered} documents rendered in this job")
+        return job_result
 
     def download_all_index2_documents(self):
         """Download all documents from the search results table, handling pagination"""
         logger.info("Downloading all documents from search results...")
         
         try:
-            # First check if we're on the search results page with a table
-            if not self.browser.find_elements(By.ID, "RegistrationGrid"):
-                logger.error("No search results table found")
-                self.browser.save_screenshot(os.path.join(self.downloads_path, "no_results_table.png"))
-                raise Exception("No search results table found")
+            # Enumerate every row first, then render the reports
+            records = self.harvest_search_results()
+            if not self.search_key:
+                return self.download_harvested_documents(records)
             
-            all_results = []
-            original_window = self.browser.current_window_handle
-            current_page = 1
-            
-            # Process each page of results
-            while True:
-                logger.info(f"Processing page {current_page} of results")
-                
-                # Take a screenshot of the current page
-                self.browser.save_screenshot(os.path.join(self.downloads_path, f"search_results_page_{current_page}.png"))
-                
-                # Process the current page
-                try:
-                    # We need to collect all data and buttons first, before processing any
-                    documents_to_process = []
-                    
-                    try:
-                        # Find the registration grid
-                        grid = self.browser.find_element(By.ID, "RegistrationGrid")
-                        
-                        # Find all rows except the header
-                        rows = grid.find_elements(By.TAG_NAME, "tr")
-                        
-                        # Check if the last row is pagination
-                        pagination_row = None
-                        if len(rows) > 2 and "Page$" in rows[-1].get_attribute("innerHTML"):
-                            pagination_row = rows[-1]
-                            # Remove the pagination row from processing
-                            rows = rows[1:-1]  # Skip header and pagination rows
-                        else:
-                            # Skip just the header row
-                            rows = rows[1:]
-                        
-                        # Process each row to extract data and button
-                        for i, row in enumerate(rows):
-                            try:
-                                # Extract information from the row
-                                columns = row.find_elements(By.TAG_NAME, "td")
-                                
-                                doc_number = columns[0].text.strip() if len(columns) > 0 else f"Unknown_{i+1}"
-                                doc_type = columns[1].text.strip() if len(columns) > 1 else "Unknown"
-                                reg_date = columns[2].text.strip() if len(columns) > 2 else "Unknown"
-                                sro_name = columns[3].text.strip() if len(columns) > 3 else "Unknown"
-                                
-                                # Find the IndexII button in this row
-                                index2_button = None
-                                for column in columns:
-                                    buttons = column.find_elements(By.CSS_SELECTOR, "input[value='IndexII']")
-                                    if buttons:
-                                        index2_button = buttons[0]
-                                        break
-                                
-                                if not index2_button:
-                                    logger.warning(f"No IndexII button found in row {i+1}")
-                                    continue
-                                
-                                property_info = {
-                                    "doc_number": doc_number,
-                                    "doc_type": doc_type,
-                                    "reg_date": reg_date,
-                                    "sro_name": sro_name,
-                                    "district_name": self.get_district_name(None),
-                                    "taluka_name": self.get_taluka_name(None),
-                                    "village_name": self.get_village_name(None),
-                                    "property_number": f"{self.current_property_number}_{doc_number}",
-                                    "year": reg_date.split('/')[-1] if '/' in reg_date else "Unknown",
-                                    "page": current_page
-                                }
-                                
-                                # Store the row info, not the button itself (to avoid stale element issues)
-                                documents_to_process.append({
-                                    "row_index": i,
-                                    "property_info": property_info
-                                })
-                                
-                            except Exception as row_error:
-                                logger.warning(f"Error processing row {i+1}: {row_error}")
-                    
-                    except Exception as grid_error:
-                        logger.error(f"Error processing registration grid: {grid_error}")
-                        
-                        # Fallback: Try to find buttons directly
-                        index2_buttons = self.browser.find_elements(By.CSS_SELECTOR, "input[value='IndexII']")
-                        
-                        for i, button in enumerate(index2_buttons):
-                            property_info = {
-                                "doc_number": f"doc_{i+1}",
-                                "district_name": self.get_district_name(None),
-                                "taluka_name": self.get_taluka_name(None),
-                                "village_name": self.get_village_name(None),
-                                "property_number": f"{self.current_property_number}_{i+1}",
-                                "year": "Unknown",
-                                "page": current_page
-                            }
-                            
-                            documents_to_process.append({
-                                "button_index": i,
-                                "property_info": property_info
-                            })
-                    
-                    # Now process each document on the current page
-                    logger.info(f"Found {len(documents_to_process)} documents to process on page {current_page}")
-                    
-                    for i, doc_info in enumerate(documents_to_process):
-                        try:
-                            logger.info(f"Processing document {i+1} of {len(documents_to_process)} on page {current_page}")
-                            
-                            # Take screenshot before starting
-                            self.browser.save_screenshot(os.path.join(self.downloads_path, f"before_processing_page{current_page}_doc{i+1}.png"))
-                            
-                            # We need to find the button again to avoid stale element issues
-                            index2_buttons = []
-                            max_retries = 3
-                            retry_count = 0
-                            
-                            while retry_count < max_retries and not index2_buttons:
-                                try:
-                                    # Try multiple ways to find the buttons
-                                    index2_buttons = self.browser.find_elements(By.CSS_SELECTOR, "input[value='IndexII']")
-                                    if not index2_buttons:
-                                        # Try finding within the grid
-                                        grid = self.browser.find_element(By.ID, "RegistrationGrid")
-                                        index2_buttons = grid.find_elements(By.CSS_SELECTOR, "input[value='IndexII']")
-                                except:
-                                    retry_count += 1
-                                    time.sleep(1)
-                            
-                            if not index2_buttons or len(index2_buttons) <= i:
-                                logger.error(f"Button for document {i+1} not found or index out of range")
-                                continue
-                            
-                            # Get the current button to click
-                            button = index2_buttons[i]
-                            property_info = doc_info["property_info"]
-                            
-                            # Store all current window handles before clicking
-                            handles_before = set(self.browser.window_handles)
-                            
-                            # Wait a moment before clicking to ensure the page is ready
-                            time.sleep(1)
-                            
-                            # Use JavaScript to click the button
-                            self.browser.execute_script("arguments[0].click();", button)
-                            logger.info(f"Clicked IndexII button {i+1} on page {current_page}")
-                            
-                            # Wait for new window/tab to open
-                            wait_start = time.time()
-                            max_wait = 30  # seconds
-                            new_handle = None
-                            
-                            while time.time() - wait_start < max_wait:
-                                handles_after = set(self.browser.window_handles)
-                                new_handles = handles_after - handles_before
-                                
-                                if new_handles:
-                                    new_handle = list(new_handles)[0]
-                                    logger.info(f"New window opened with handle: {new_handle}")
-                                    break
-                                
-                                time.sleep(0.5)
-                            
-                            # Switch to the newly opened window/tab if found
-                            if new_handle:
-                                self.browser.switch_to.window(new_handle)
-                                logger.info(f"Switched to new window with URL: {self.browser.current_url}")
-                                
-                                # Wait for the page to load
-                                try:
-                                    WebDriverWait(self.browser, 60).until(
-                                        lambda d: d.execute_script("return document.readyState") == "complete"
-                                    )
-                                except:
-                                    logger.warning("Timeout waiting for page to load completely")
-                                
-                                # Take screenshot after switching
-                                self.browser.save_screenshot(os.path.join(self.downloads_path, f"after_switch_page{current_page}_doc{i+1}.png"))
-                                
-                                # Download the document
-                                try:
-                                    result = self.download_indexii_document(self.browser.current_url, property_info)
-                                    all_results.append(result)
-                                    logger.info(f"Successfully downloaded document {i+1} from page {current_page}")
-                                except Exception as download_error:
-                                    logger.error(f"Error downloading document {i+1} from page {current_page}: {download_error}")
-                                
-                                # Close the tab and switch back to the original window
-                                self.browser.close()
-                                self.browser.switch_to.window(original_window)
-                                logger.info(f"Closed document window and switched back to search results")
-                                
-                                # Wait a moment for the page to stabilize after switching back
-                                time.sleep(2)
-                                
-                                # DO NOT refresh the page - instead wait for elements to be interactive
-                                try:
-                                    # Wait for the grid to be present and interactive
-                                    WebDriverWait(self.browser, 30).until(
-                                        EC.presence_of_element_located((By.ID, "RegistrationGrid"))
-                                    )
-                                    time.sleep(1)  # Short wait for stability
-                                except Exception as wait_error:
-                                    logger.warning(f"Error waiting for grid after switch: {wait_error}")
-                                    # Continue anyway as the elements might still be usable
-                        
-                        except Exception as button_error:
-                            logger.error(f"Processing document {i+1} on page {current_page}: {button_error}")
-                            self.browser.save_screenshot(os.path.join(self.downloads_path, f"doc_error_page{current_page}_doc{i+1}.png"))
-                            
-                            # Try to switch back to original window
-                            try:
-                                self.browser.switch_to.window(original_window)
-                            except:
-                                pass
-                    
-                    # Check if we should navigate to the next page
-                    has_more_pages = False
-                    next_page_xpath = None
-                    
-                    try:
-                        # Find the registration grid again
-                        grid = self.browser.find_element(By.ID, "RegistrationGrid")
-                        rows = grid.find_elements(By.TAG_NAME, "tr")
-                        
-                        # Find pagination row
-                        if len(rows) > 2 and "Page$" in rows[-1].get_attribute("innerHTML"):
-                            pagination_row = rows[-1]
-                            
-                            # Look for next page link
-                            next_page_num = current_page + 1
-                            next_page_xpath = f".//a[contains(@href, 'Page${next_page_num}')]"
-                            next_page_links = pagination_row.find_elements(By.XPATH, next_page_xpath)
-                            
-                            if next_page_links:
-                                has_more_pages = True
-                                logger.info(f"Found link to next page: {next_page_num}")
-                            else:
-                                # Look for "..." link that might lead to more pages
-                                dots_xpath = ".//a[text()='...']"
-                                dots_links = pagination_row.find_elements(By.XPATH, dots_xpath)
-                                if dots_links:
-                                    has_more_pages = True
-                                    next_page_xpath = dots_xpath
-                                    logger.info("Found '...' link to more pages")
-                                else:
-                                    logger.info("No more pages found")
-                    except Exception as pagination_error:
-                        logger.warning(f"Error checking pagination: {pagination_error}")
-                        has_more_pages = False
-                        next_page_xpath = None
-                    
-                    if has_more_pages and next_page_xpath:
-                        logger.info(f"Navigating to page {current_page + 1}")
-                        
-                        try:
-                            # Save screenshot before clicking
-                            self.browser.save_screenshot(os.path.join(self.downloads_path, f"before_page_{current_page + 1}.png"))
-                            
-                            # Find the next page link again to avoid stale element
-                            next_page_link = self.browser.find_element(By.XPATH, next_page_xpath)
-                            
-                            # Try regular click first
-                            try:
-                                next_page_link.click()
-                                logger.info("Clicked next page link")
-                            except:
-                                # If regular click fails, try JavaScript click
-                                logger.info("Regular click failed, trying JavaScript click")
-                                self.browser.execute_script("arguments[0].click();", next_page_link)
-                            
-                            # Wait for the current grid to become stale
-                            WebDriverWait(self.browser, 30).until(
-                                EC.staleness_of(grid)
-                            )
-                            
-                            # Wait for the new grid to appear
-                            WebDriverWait(self.browser, 30).until(
-                                EC.presence_of_element_located((By.ID, "RegistrationGrid"))
-                            )
-                            
-                            # Additional wait for page to stabilize
-                            time.sleep(3)
-                            
-                            # Verify we're on the next page
-                            try:
-                                new_grid = self.browser.find_element(By.ID, "RegistrationGrid")
-                                new_rows = new_grid.find_elements(By.TAG_NAME, "tr")
-                                if len(new_rows) > 1:  # At least header row and one data row
-                                    current_page += 1
-                                    logger.info(f"Successfully navigated to page {current_page}")
-                                else:
-                                    logger.warning("New page appears to be empty")
-                            except:
-                                logger.warning("Could not verify new page content")
-                            
-                            # Save screenshot after navigation
-                            self.browser.save_screenshot(os.path.join(self.downloads_path, f"after_page_{current_page}.png"))
-                            
-                        except Exception as navigation_error:
-                            logger.error(f"Error navigating to next page: {navigation_error}")
-                            self.browser.save_screenshot(os.path.join(self.downloads_path, f"navigation_error_page{current_page}.png"))
-                            break
-                    else:
-                        logger.info(f"No more pages to process after page {current_page}")
-                        break
-                    
-                except Exception as page_error:
-                    logger.error(f"Error processing page {current_page}: {page_error}")
-                    self.browser.save_screenshot(os.path.join(self.downloads_path, f"page_error_{current_page}.png"))
-                    break
+            # Only render documents that were not downloaded by an earlier run
+            self.search_cache.put_results(self.search_key, records)
+            stored = self.search_cache.get_documents(self.search_key)
+            missing = [record for record in records if record["doc_number"] not in stored]
+            logger.info(f"{len(records) - len(missing)} of {len(records)} documents already downloaded")
             
-            logger.info(f"Downloaded {len(all_results)} documents successfully from {current_page} pages")
-            return all_results
+            # Reused results are marked so their compaction savings are not reported again
+            results = [dict(stored[record["doc_number"]], cached=True) for record in records if record["doc_number"] in stored]
+            return results + self.download_harvested_documents(missing)
             
         except Exception as e:
             logger.error(f"Error downloading all documents: {e}")
             self.browser.save_screenshot(os.path.join(self.downloads_path, "download_all_error.png"))
             raise
 
+    def summarize_records(self, records):
+        """Row fields reported by navigation-only runs"""
+        return [{
+            "doc_number": record["doc_number"],
+            "doc_type": record["doc_type"],
+            "reg_date": record["reg_date"],
+            "sro_name": record["sro_name"],
+            "page": record["page"]
+        } for record in records]
+
     def test_page_navigation(self):
         """Test page navigation in search results without downloading documents"""
         logger.info("Testing page navigation in search results...")
         
         try:
-            # First check if we're on the search results page with a table
-            if not self.browser.find_elements(By.ID, "RegistrationGrid"):
-                logger.error("No search results table found")
-                self.browser.save_screenshot(os.path.join(self.downloads_path, "no_results_table.png"))
-                raise Exception("No search results table found")
-            
-            all_results = []
-            current_page = 1
-            
-            # Process each page of results
-            while True:
-                logger.info(f"Processing page {current_page} of results")
-                
-                # Take a screenshot of the current page
-                self.browser.save_screenshot(os.path.join(self.downloads_path, f"search_results_page_{current_page}.png"))
-                
-                try:
-                    # Find the registration grid
-                    grid = self.browser.find_element(By.ID, "RegistrationGrid")
-                    
-                    # Find all rows except the header
-                    rows = grid.find_elements(By.TAG_NAME, "tr")
-                    
-                    # Check if the last row is pagination
-                    pagination_row = None
-                    if len(rows) > 2 and "Page$" in rows[-1].get_attribute("innerHTML"):
-                        pagination_row = rows[-1]
-                        # Remove the pagination row from processing
-                        rows = rows[1:-1]  # Skip header and pagination rows
-                    else:
-                        # Skip just the header row
-                        rows = rows[1:]
-                    
-                    # Log the number of records on current page
-                    logger.info(f"Found {len(rows)} records on page {current_page}")
-                    
-                    # Save page source for analysis
-                    page_source_path = os.path.join(self.downloads_path, f"page_{current_page}_source.html")
-                    with open(page_source_path, "w", encoding="utf-8") as f:
-                        f.write(self.browser.page_source)
-                    logger.info(f"Saved page source to {page_source_path}")
-                    
-                    # Process each row to extract data (without clicking buttons)
-                    for i, row in enumerate(rows):
-                        try:
-                            # Extract information from the row
-                            columns = row.find_elements(By.TAG_NAME, "td")
-                            
-                            doc_info = {
-                                "doc_number": columns[0].text.strip() if len(columns) > 0 else f"Unknown_{i+1}",
-                                "doc_type": columns[1].text.strip() if len(columns) > 1 else "Unknown",
-                                "reg_date": columns[2].text.strip() if len(columns) > 2 else "Unknown",
-                                "sro_name": columns[3].text.strip() if len(columns) > 3 else "Unknown",
-                                "page": current_page
-                            }
-                            
-                            all_results.append(doc_info)
-                            logger.info(f"Processed record {i+1} on page {current_page}: {doc_info['doc_number']}")
-                            
-                        except Exception as row_error:
-                            logger.warning(f"Error processing row {i+1} on page {current_page}: {row_error}")
-                    
-                    # Check if pagination exists and if there are more pages
-                    has_more_pages = False
-                    next_page_link = None
-                    
-                    if pagination_row:
-                        try:
-                            # Look for links to next pages
-                            next_page_num = current_page + 1
-                            next_page_links = pagination_row.find_elements(By.XPATH, f".//a[contains(@href, 'Page${next_page_num}')]")
-                            
-                            if next_page_links:
-                                next_page_link = next_page_links[0]
-                                has_more_pages = True
-                                logger.info(f"Found link to next page: {next_page_num}")
-                            else:
-                                # Look for "..." link that might lead to more pages
-                                dots_xpath = ".//a[text()='...']"
-                                dots_links = pagination_row.find_elements(By.XPATH, dots_xpath)
-                                if dots_links:
-                                    has_more_pages = True
-                                    next_page_xpath = dots_xpath
-                                    logger.info("Found '...' link to more pages")
-                                else:
-                                    logger.info("No more pages found")
-                        
-                        except Exception as pagination_error:
-                            logger.warning(f"Error checking pagination: {pagination_error}")
-                    
-                    # Navigate to next page if available
-                    if has_more_pages and next_page_link:
-                        logger.info(f"Attempting to navigate to page {current_page + 1}")
-                        
-                        try:
-                            # Save screenshot before clicking
-                            self.browser.save_screenshot(os.path.join(self.downloads_path, f"before_page_{current_page + 1}.png"))
-                            
-                            # Find the next page link again to avoid stale element
-                            next_page_link = self.browser.find_element(By.XPATH, next_page_xpath)
-                            
-                            # Try regular click first
-                            try:
-                                next_page_link.click()
-                                logger.info("Clicked next page link")
-                            except:
-                                # If regular click fails, try JavaScript click
-                                logger.info("Regular click failed, trying JavaScript click")
-                                self.browser.execute_script("arguments[0].click();", next_page_link)
-                            
-                            # Wait for the current grid to become stale
-                            WebDriverWait(self.browser, 30).until(
-                                EC.staleness_of(grid)
-                            )
-                            
-                            # Wait for the new grid to appear
-                            WebDriverWait(self.browser, 30).until(
-                                EC.presence_of_element_located((By.ID, "RegistrationGrid"))
-                            )
-                            
-                            # Additional wait for page to stabilize
-                            time.sleep(10)
-                            
-                            # Verify we're on the next page
-                            try:
-                                new_grid = self.browser.find_element(By.ID, "RegistrationGrid")
-                                new_rows = new_grid.find_elements(By.TAG_NAME, "tr")
-                                if len(new_rows) > 1:  # At least header row and one data row
-                                    current_page += 1
-                                    logger.info(f"Successfully navigated to page {current_page}")
-                                else:
-                                    logger.warning("New page appears to be empty")
-                            except:
-                                logger.warning("Could not verify new page content")
-                            
-                            # Save screenshot after navigation
-                            self.browser.save_screenshot(os.path.join(self.downloads_path, f"after_page_{current_page}.png"))
-                            
-                        except Exception as navigation_error:
-                            logger.error(f"Error navigating to next page: {navigation_error}")
-                            self.browser.save_screenshot(os.path.join(self.downloads_path, f"navigation_error_page{current_page}.png"))
-                            break
-                    else:
-                        logger.info(f"No more pages to process after page {current_page}")
-                        break
-                    
-                except Exception as page_error:
-                    logger.error(f"Error processing page {current_page}: {page_error}")
-                    self.browser.save_screenshot(os.path.join(self.downloads_path, f"page_error_{current_page}.png"))
-                    break
+            records = self.harvest_search_results()
+            if self.search_key:
+                self.search_cache.put_results(self.search_key, records)
             
-            logger.info(f"Successfully processed {len(all_results)} records across {current_page} pages")
+            all_results = self.summarize_records(records)
             
             # Save all results to a JSON file
             results_file = os.path.join(self.downloads_path, "navigation_results.json")
@@ -1638,41 +4406,6 @@ class Index2Downloader:
             self.browser.save_screenshot(os.path.join(self.downloads_path, "navigation_test_error.png"))
             raise
 
-    def is_new_captcha_present(self):
-        """Check if a new captcha appears after search button click"""
-        try:
-            # Check for captcha image
-            captcha_element = self.browser.find_element(By.ID, "imgCaptcha_new")
-            # Check for captcha input field
-            captcha_input = self.browser.find_element(By.ID, "txtImg1")
-            return captcha_element.is_displayed() and captcha_input.is_displayed()
-        except:
-            return False
-
-    def solve_and_submit_new_captcha(self):
-        """Solve and submit new captcha that appears after search button click"""
-        try:
-            # Solve the new captcha
-            captcha_text = self.solve_captcha()
-            
-            # Enter the new captcha
-            captcha_input = self.browser.find_element(By.ID, "txtImg1")
-            captcha_input.clear()
-            captcha_input.send_keys(captcha_text)
-            
-            # Click search button again
-            search_button = self.browser.find_element(By.ID, "btnSearch_RestMaha")
-            search_button.click()
-            logger.info("Submitted new captcha and clicked search button again")
-            
-            # Wait 40 seconds after submitting new captcha
-            logger.info("Waiting 40 seconds after submitting new captcha...")
-            time.sleep(40)
-            
-        except Exception as e:
-            logger.error(f"Error handling new captcha: {e}")
-            raise
-    
     def get_district_name(self, district_code):
         """Get district name from code"""
         try:
@@ -1727,18 +4460,318 @@ class Index2Downloader:
             pass
         return None
     
-    def close(self):
-        """Close the browser"""
+    def quit_browser(self, timeout=30):
+        """Quit the browser, hard-killing whatever survives or hangs"""
+        if self.cdp_events:
+            self.cdp_events.close()
+            self.cdp_events = None
         if self.browser:
             logger.info("Closing browser")
-            try:
-                self.browser.quit()
-            except Exception as e:
-                logger.warning(f"Error closing browser: {e}")
+            browser = self.browser
             self.browser = None
             
+            # quit() blocks forever on a wedged chromedriver
+            quitter = threading.Thread(target=self.quit_quietly, args=(browser,), daemon=True)
+            quitter.start()
+            quitter.join(timeout)
+            if quitter.is_alive():
+                logger.warning(f"Browser did not quit within {timeout}s")
+        self.supervisor.kill_tree()
+        
+    @staticmethod
+    def quit_quietly(browser):
+        try:
+            browser.quit()
+        except Exception as e:
+            logger.warning(f"Error closing browser: {e}")
+        
+    def abort_job(self):
+        """Wall-clock watchdog: kill the browser so every pending WebDriver call fails"""
+        logger.error(f"Job exceeded its {self.job_timeout}s limit, killing the browser")
+        self.job_timed_out = True
+        JOB_TIMEOUTS.inc()
+        self.supervisor.kill_tree()
+        
+    def close(self):
+        """Close the browser"""
+        self.quit_browser()
+        self.release_job_slot()
+        if self.profile_slot:
+            self.profile_slot.release()
+            self.profile_slot = None
+            
+    def acquire_job_slot(self):
+        """Take a share of the browser capacity for the current job, once per job"""
+        if not self.scheduler or self.holding_slot:
+            return
+        waited = self.scheduler.acquire(self.job_priority)
+        self.holding_slot = True
+        if waited > 1:
+            logger.info(f"{self.job_priority.capitalize()} job waited {waited:.1f}s for browser capacity")
+        self.start_watchdog()
+    
+    @contextmanager
+    def job_deadline(self):
+        """Enforce job_timeout on the enclosed job and free its browser capacity at the end"""
+        # The wall-clock limit is armed once the job holds browser capacity, so queueing does not count
+        self.job_timed_out = False
+        self.job_time_left = self.job_timeout
+        try:
+            yield
+            if self.job_timed_out:
+                raise JobTimeoutError(f"Job exceeded its {self.job_timeout}s limit")
+        except Exception as e:
+            if not self.job_timed_out:
+                raise
+            self.quit_browser(timeout=5)
+            if isinstance(e, JobTimeoutError):
+                raise
+            raise JobTimeoutError(f"Job exceeded its {self.job_timeout}s limit") from e
+        finally:
+            self.stop_watchdog()
+            self.release_job_slot()
+    
+    def start_watchdog(self):
+        """Arm the job's wall-clock limit with the time it has left"""
+        if not self.job_timeout or self.watchdog:
+            return
+        self.watchdog = threading.Timer(max(0, self.job_time_left), self.abort_job)
+        self.watchdog.daemon = True
+        self.watchdog.start()
+        self.watchdog_started = time.time()
+    
+    def stop_watchdog(self):
+        """Disarm the limit, keeping the unused time for a job that is only pausing"""
+        if self.watchdog:
+            self.watchdog.cancel()
+            self.job_time_left -= time.time() - self.watchdog_started
+            self.watchdog = None
+    
+    def pause_for_higher_priority(self):
+        """Give the slot to queued higher-priority work; time spent paused does not count against the job"""
+        logger.info(f"Pausing {self.job_priority} job for property {self.current_property_number} for higher-priority work")
+        self.stop_watchdog()
+        paused = self.scheduler.yield_slot(self.job_priority)
+        self.start_watchdog()
+        logger.info(f"Resuming {self.job_priority} job after {paused:.1f}s")
+    
+    def release_job_slot(self):
+        if self.holding_slot:
+            self.scheduler.release(self.job_priority)
+            self.holding_slot = False
+    
+    def yield_if_preempted(self, page, original_window):
+        """At a document boundary, step aside while higher-priority jobs are queued for capacity"""
+        if not self.holding_slot or not self.scheduler.should_yield(self.job_priority):
+            return original_window
+        
+        self.pause_for_higher_priority()
+        
+        # The site session can expire while the job is paused
+        try:
+            if self.browser.find_elements(By.ID, "RegistrationGrid"):
+                return original_window
+        except Exception as e:
+            logger.warning(f"Browser unusable after pause: {e}")
+        return self.restore_results_page(page)
+    
     def download_document(self, params):
         """Download documents based on the provided parameters"""
+        self.job_priority = params.get('priority', 'interactive')
+        self.command_stats = WebDriverCommandStats()
+        self.page_weight = {}
+        self.launch_timings = None
+        tracer = None
+        trace_file = None
+        
+        if self.trace:
+            # One trace file per job, viewable in chrome://tracing or Perfetto
+            job_name = re.sub(r'[^\w.-]', '_', f"{params.get('property_number')}_{time.strftime('%Y%m%d_%H%M%S')}")
+            tracer = JobTracer(os.path.join(self.downloads_path, "traces", f"{job_name}.json"), profile=self.profile)
+            tracer.start()
+        
+        try:
+            with self.job_deadline():
+                result = self.run_download_job(params)
+        finally:
+            self.latency.save()
+            if tracer:
+                trace_file = tracer.finish()
+            logger.info(self.command_stats.format_report())
+        
+        if isinstance(result, dict):
+            result["webdriver_commands"] = self.command_stats.report()
+            if self.page_weight:
+                result["page_weight"] = self.page_weight
+            if self.launch_timings:
+                result["browser_launch"] = self.launch_timings
+            if trace_file:
+                result["trace_file"] = trace_file
+        return result
+
+    def run_search(self, year, district_name, taluka_name, village_name, property_number):
+        """Open the search page, fill in the query and submit it, leaving the results grid on screen"""
+        site_breaker.check(self.park_timeout)
+        
+        # Wait for browser capacity; cached answers never get here
+        self.acquire_job_slot()
+        
+        if not self.browser:
+            self.initialize()
+        
+        # Navigate to search page, reporting the outcome to the shared circuit breaker
+        self.last_search = (year, district_name, taluka_name, village_name, property_number)
+        self.page_weight = {}
+        self.apply_network_policy(block=True)
+        self.check_search_cancelled()
+        try:
+            self.navigate_to_search_page()
+        except SiteUnavailableError:
+            raise
+        except Exception:
+            site_breaker.record_failure()
+            raise
+        site_breaker.record_success()
+        self.measure_page_weight("search")
+        
+        # Fill search form
+        self.check_search_cancelled()
+        self.fill_search_form(
+            year, district_name, taluka_name, 
+            village_name, property_number
+        )
+        
+        # Submit form, remembering searches that found nothing
+        try:
+            self.submit_search_form()
+        except NoSearchResultsError as e:
+            self.search_cache.put_negative(self.search_key, e.outcome)
+            raise
+        self.measure_page_weight("results")
+
+    @timed_stage('sync_property')
+    def sync_property(self, params, download_new=True):
+        """Re-run the search for a watched property and download only registrations not seen before"""
+        year = params['year']
+        district_name = params['district_name']
+        taluka_name = params['taluka_name']
+        village_name = params['village_name']
+        property_number = params['property_number']
+        
+        logger.info(f"Syncing watched property {property_number}...")
+        
+        self.job_priority = params.get('priority', 'bulk')
+        self.current_property_number = property_number
+        self.search_key = SearchResultCache.make_key(year, district_name, taluka_name, village_name, property_number)
+        state = self.watch_store.get(self.search_key)
+        seen = set(state["doc_numbers"]) if state else set()
+        last_reg_date = state["last_reg_date"] if state else None
+        
+        with self.job_deadline():
+            try:
+                self.run_search(year, district_name, taluka_name, village_name, property_number)
+                records = self.harvest_search_results()
+                self.search_cache.put_results(self.search_key, records)
+            except NoSearchResultsError:
+                logger.info(f"No registrations found for property {property_number}")
+                records = []
+            
+            new_records = [record for record in records if record["doc_number"] not in seen]
+            logger.info(f"Property {property_number}: {len(new_records)} new of {len(records)} registrations")
+            
+            results = []
+            if new_records and download_new:
+                results = self.download_harvested_documents(new_records)
+        
+        # Remember everything seen so far and the latest registration date
+        dates = [parse_reg_date(record["reg_date"]) for record in records]
+        dates = [date for date in dates if date]
+        if last_reg_date:
+            dates.append(datetime.strptime(last_reg_date, "%d/%m/%Y"))
+        new_last_reg_date = max(dates).strftime("%d/%m/%Y") if dates else None
+        
+        if download_new:
+            # Only documents that are stored count as seen, so failed downloads are retried by the next sync
+            stored = self.search_cache.get_documents(self.search_key)
+            now_seen = {record["doc_number"] for record in records if record["doc_number"] in stored}
+            missing = len([record for record in new_records if record["doc_number"] not in stored])
+            if missing:
+                logger.warning(f"Property {property_number}: {missing} new registrations were not downloaded and will be retried")
+        else:
+            # Listing-only syncs report each registration once
+            now_seen = {record["doc_number"] for record in records}
+        
+        watch_params = {key: params[key] for key in ('year', 'district_name', 'taluka_name', 'village_name', 'property_number')}
+        self.watch_store.put(self.search_key, watch_params, seen | now_seen, new_last_reg_date)
+        
+        return {
+            "success": True,
+            "property_number": property_number,
+            "first_sync": state is None,
+            "previous_reg_date": last_reg_date,
+            "last_reg_date": new_last_reg_date,
+            "total_records": len(records),
+            "new_count": len(new_records),
+            "new_records": self.summarize_records(new_records),
+            "results": results
+        }
+
+    def sync_portfolio(self, properties=None, download_new=True):
+        """Sync every property in the list (or every watched property) and return the deltas"""
+        if properties is None:
+            properties = self.watch_store.list_properties()
+        
+        deltas = []
+        for params in properties:
+            try:
+                deltas.append(self.sync_property(params, download_new=download_new))
+            except SiteUnavailableError:
+                raise
+            except Exception as e:
+                logger.error(f"Error syncing property {params.get('property_number')}: {e}")
+                deltas.append({
+                    "success": False,
+                    "property_number": params.get('property_number'),
+                    "error": str(e)
+                })
+        
+        self.latency.save()
+        logger.info(f"Synced {len(deltas)} properties, {sum(d.get('new_count', 0) for d in deltas)} new registrations")
+        return deltas
+
+    def answer_from_cache(self, cached, navigation_only):
+        """Build the job result from a cached search, or return None if the site must be visited"""
+        if cached["outcome"] != "results":
+            logger.info(f"Search outcome '{cached['outcome']}' is cached, not repeating the search")
+            raise NoSearchResultsError(f"No records found for property {self.current_property_number} (cached)", cached["outcome"])
+        
+        records = cached["records"]
+        if navigation_only:
+            logger.info(f"Returning {len(records)} cached records")
+            return {
+                "success": True,
+                "records": self.summarize_records(records),
+                "count": len(records),
+                "navigation_test": True,
+                "cached": True
+            }
+        
+        stored = self.search_cache.get_documents(self.search_key)
+        if records and all(record["doc_number"] in stored for record in records):
+            logger.info(f"All {len(records)} documents already downloaded")
+            results = [stored[record["doc_number"]] for record in records]
+            return {
+                "success": True,
+                "results": results,
+                "count": len(results),
+                "cached": True
+            }
+        
+        return None
+
+    @timed_stage('download_document')
+    def run_download_job(self, params):
+        """Search for a property and download or list its documents"""
         year = params['year']
         district_name = params['district_name']
         taluka_name = params['taluka_name']
@@ -1749,17 +4782,16 @@ class Index2Downloader:
         logger.info(f"Starting {'navigation test' if navigation_only else 'download process'} for property {property_number}...")
         
         try:
-            # Navigate to search page
-            self.navigate_to_search_page()
+            # Answer from the cache when possible, without starting a browser
+            self.current_property_number = property_number
+            self.search_key = SearchResultCache.make_key(year, district_name, taluka_name, village_name, property_number)
+            cached = None if params.get('refresh') else self.search_cache.get(self.search_key)
+            if cached:
+                cached_result = self.answer_from_cache(cached, navigation_only)
+                if cached_result:
+                    return cached_result
             
-            # Fill search form
-            self.fill_search_form(
-                year, district_name, taluka_name, 
-                village_name, property_number
-            )
-            
-            # Submit form
-            self.submit_search_form()
+            self.run_search(year, district_name, taluka_name, village_name, property_number)
             
             # If we just want to test navigation
             if navigation_only:
@@ -1774,22 +4806,14 @@ class Index2Downloader:
             # If we want to download all docs in the search results
             elif params.get('download_all', False):
                 results = self.download_all_index2_documents()
-                return {
-                    "success": True,
-                    "results": results,
-                    "count": len(results)
-                }
+                return self.finish_download_results(results)
             else:
                 # Find all IndexII buttons first to know how many are available
                 index2_buttons = self.browser.find_elements(By.CSS_SELECTOR, "input[value='IndexII']")
                 if index2_buttons:
                     logger.info(f"Found {len(index2_buttons)} IndexII buttons, downloading all")
                     results = self.download_all_index2_documents()
-                    return {
-                        "success": True,
-                        "results": results,
-                        "count": len(results)
-                    }
+                    return self.finish_download_results(results)
                 else:
                     # If no buttons found, try the original method
                     # Click Index-2 link and get PDF content
@@ -1807,6 +4831,7 @@ class Index2Downloader:
                     
                     # Download the document
                     result = self.download_indexii_document(index2_url, property_info)
+                    self.finish_pending_renders()
                     
                     return result
                 
@@ -1850,7 +4875,7 @@ def index():
         # Initialize downloader
         downloader = Index2Downloader(headless=True, downloads_path='downloads')
         try:
-            downloader.initialize()
+            # The browser is only started if the answer is not cached
             result = downloader.download_document(params)
             return render_template('result.html', result=result)
         except Exception as e:
@@ -1860,5 +4885,47 @@ def index():
     
     return render_template('index.html', years=years, districts=districts)
 
+@app.route('/metrics')
+def metrics():
+    """Per-stage latency and throughput metrics in Prometheus text format"""
+    return Response(generate_latest(), content_type=CONTENT_TYPE_LATEST)
+
+@app.route('/documents')
+def documents():
+    """Query the fields extracted from downloaded reports, e.g. /documents?party=...&village=...&min_consideration=..."""
+    args = request.args
+    try:
+        results = IndexIIDatabase.shared(os.path.join('downloads', "indexii.sqlite3")).query(
+            party=args.get('party'),
+            village=args.get('village'),
+            min_consideration=args.get('min_consideration', type=float),
+            max_consideration=args.get('max_consideration', type=float),
+            doc_number=args.get('doc_number'),
+            sro_name=args.get('sro_name'),
+            date_from=args.get('date_from'),
+            date_to=args.get('date_to'),
+            limit=args.get('limit', 100, type=int)
+        )
+        return jsonify({"count": len(results), "documents": results})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/search')
+def search():
+    """Full-text search over downloaded reports, e.g. /search?q=पाटील 12/3"""
+    start_time = time.time()
+    try:
+        hits = IndexIIDatabase.shared(os.path.join('downloads', "indexii.sqlite3")).search(
+            request.args.get('q', ''), limit=request.args.get('limit', 20, type=int)
+        )
+        return jsonify({
+            "query": request.args.get('q', ''),
+            "count": len(hits),
+            "hits": hits,
+            "elapsed_ms": round((time.time() - start_time) * 1000, 2)
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 if __name__ == "__main__":
     app.run(debug=True,port=5008)
\ No newline at end of file